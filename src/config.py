@@ -2,10 +2,50 @@
 Конфигурация воркера Pump Bot.
 """
 
-import os
-from typing import Optional, List
-from pydantic import Field, ConfigDict, validator
-from pydantic_settings import BaseSettings
+from contextvars import ContextVar
+from functools import cached_property
+from pathlib import Path
+from typing import Annotated, Any, Dict, Mapping, Optional, List, Tuple
+from pydantic import Field, field_validator
+from pydantic_settings import (
+    BaseSettings,
+    DotEnvSettingsSource,
+    NoDecode,
+    PydanticBaseSettingsSource,
+    SettingsConfigDict,
+)
+from pydantic_settings.sources import DotenvType
+
+# Файл окружения по умолчанию
+ENV_FILE = ".env"
+
+# .env текущего создания WorkerConfig (для settings_customise_sources)
+_env_file_var: ContextVar[Optional[DotenvType]] = ContextVar("_env_file_var", default=ENV_FILE)
+
+
+class CachedDotEnvSettingsSource(DotEnvSettingsSource):
+    """Источник настроек из .env с кэшированием разбора по mtime файла."""
+
+    _cache: Dict[tuple, Mapping[str, Optional[str]]] = {}
+    _cache_size = 4
+
+    def _read_env_file(self, file_path: Path) -> Mapping[str, Optional[str]]:
+        key = (
+            str(file_path.resolve()),
+            file_path.stat().st_mtime_ns,
+            self.env_file_encoding,
+            self.case_sensitive,
+            self.env_ignore_empty,
+            self.env_parse_none_str,
+        )
+        cache = CachedDotEnvSettingsSource._cache
+        env_vars = cache.get(key)
+        if env_vars is None:
+            env_vars = super()._read_env_file(file_path)
+            if len(cache) >= self._cache_size:
+                cache.pop(next(iter(cache)))
+            cache[key] = env_vars
+        return env_vars
 
 
 class WorkerConfig(BaseSettings):
@@ -53,16 +93,24 @@ class WorkerConfig(BaseSettings):
         default=True,
         description="Включить шифрование сообщений"
     )
+    encryption_compact_framing: bool = Field(
+        default=False,
+        description="Отправлять сообщения в формате Base64(nonce+ciphertext+tag) вместо ciphertext:nonce:tag"
+    )
 
     # Solana настройки
     solana_rpc_url: str = Field(
         default="https://api.mainnet-beta.solana.com",
         description="URL Solana RPC"
     )
-    solana_rpc_urls: Optional[str] = Field(
-        default=None,
+    solana_rpc_urls: Annotated[Tuple[str, ...], NoDecode] = Field(
+        default_factory=tuple,
         description="Альтернативные RPC URLs через запятую"
     )
+    broadcast_rpcs: Annotated[Tuple[str, ...], NoDecode] = Field(
+        default_factory=tuple,
+        description="Дополнительные RPC для параллельной отправки транзакций через запятую"
+    )
     solana_private_key: str = Field(
         description="Приватный ключ Solana кошелька"
     )
@@ -74,10 +122,13 @@ class WorkerConfig(BaseSettings):
     # Торговые настройки
     max_slippage: float = Field(
         default=0.05,
+        gt=0,
+        lt=1,
         description="Максимальный слипаж (5%)"
     )
     trade_amount_sol: float = Field(
         default=0.01,
+        gt=0,
         description="Размер сделки в SOL"
     )
     max_wallets_per_worker: int = Field(
@@ -88,14 +139,20 @@ class WorkerConfig(BaseSettings):
         default=5,
         description="Максимум одновременных сделок"
     )
+    skip_preflight: bool = Field(
+        default=True,
+        description="Отправлять транзакции без preflight симуляции"
+    )
 
     # Защитные лимиты
     max_trade_size_sol: float = Field(
         default=1.0,
+        gt=0,
         description="Максимальный размер сделки"
     )
     min_trade_size_sol: float = Field(
         default=0.001,
+        gt=0,
         description="Минимальный размер сделки"
     )
     daily_trade_limit_sol: float = Field(
@@ -109,9 +166,29 @@ class WorkerConfig(BaseSettings):
         description="URL прокси сервера"
     )
     http_pool_size: int = Field(
-        default=20,
+        default=32,
         description="Размер пула HTTP соединений"
     )
+    http_connect_timeout: float = Field(
+        default=3.0,
+        description="Таймаут установки HTTP соединения (сек)"
+    )
+    http_read_timeout: float = Field(
+        default=10.0,
+        description="Таймаут чтения HTTP ответа (сек)"
+    )
+    http_write_timeout: float = Field(
+        default=10.0,
+        description="Таймаут отправки HTTP запроса (сек)"
+    )
+    http_pool_timeout: float = Field(
+        default=5.0,
+        description="Таймаут ожидания свободного соединения в пуле (сек)"
+    )
+    http_keepalive_expiry: float = Field(
+        default=19.0,
+        description="Время жизни простаивающего соединения (сек), меньше idle таймаута RPC провайдера"
+    )
     ws_ping_interval: int = Field(
         default=30,
         description="Интервал ping WebSocket (сек)"
@@ -120,6 +197,15 @@ class WorkerConfig(BaseSettings):
         default=10,
         description="Таймаут ping WebSocket (сек)"
     )
+    ws_binary_frames: bool = Field(
+        default=False,
+        description="Отправлять сообщения бинарными фреймами с байтом типа (требует поддержки координатором)"
+    )
+
+    use_uvloop: bool = Field(
+        default=True,
+        description="Использовать uvloop, если установлен"
+    )
 
     # Retry настройки
     max_retries: int = Field(
@@ -131,8 +217,19 @@ class WorkerConfig(BaseSettings):
         description="Задержка между попытками (сек)"
     )
     backoff_factor: float = Field(
-        default=2.0,
-        description="Фактор экспоненциального отступа"
+        default=3.0,
+        gt=1,
+        description="Множитель отступа: следующая задержка случайна от retry_delay до предыдущей × фактор"
+    )
+    retry_delay_cap: float = Field(
+        default=30.0,
+        gt=0,
+        description="Максимальная задержка между попытками переподключения (сек)"
+    )
+    reconnect_timeout_sec: float = Field(
+        default=300.0,
+        gt=0,
+        description="Сколько времени подряд пытаться переподключиться к координатору (сек)"
     )
 
     # Настройки отчетности
@@ -180,6 +277,11 @@ class WorkerConfig(BaseSettings):
         default=False,
         description="Имитация торговли (для тестов)"
     )
+    mock_trade_latency_s: float = Field(
+        default=0.0,
+        ge=0,
+        description="Имитируемая задержка сделки в режиме mock (сек)"
+    )
 
     # Метрики и мониторинг
     metrics_enabled: bool = Field(
@@ -245,36 +347,51 @@ class WorkerConfig(BaseSettings):
         description="Имитация задержки сети"
     )
 
-    model_config = ConfigDict(
-        env_file=".env",
+    # .env читается только через CachedDotEnvSettingsSource (см. __init__)
+    model_config = SettingsConfigDict(
         env_file_encoding="utf-8",
         extra="ignore",
-        case_sensitive=False
+        case_sensitive=False,
+        frozen=True
     )
 
-    @validator('solana_rpc_urls')
-    def parse_rpc_urls(cls, v):
+    def __init__(self, _env_file: Optional[DotenvType] = ENV_FILE, **values: Any):
+        # Встроенный источник .env читает файл сразу при создании - ему передается None,
+        # а файл (или явный отказ _env_file=None) достается кэширующему источнику
+        token = _env_file_var.set(_env_file)
+        try:
+            super().__init__(_env_file=None, **values)
+        finally:
+            _env_file_var.reset(token)
+
+    @classmethod
+    def settings_customise_sources(
+        cls,
+        settings_cls: type[BaseSettings],
+        init_settings: PydanticBaseSettingsSource,
+        env_settings: PydanticBaseSettingsSource,
+        dotenv_settings: PydanticBaseSettingsSource,
+        file_secret_settings: PydanticBaseSettingsSource,
+    ) -> Tuple[PydanticBaseSettingsSource, ...]:
+        """Подмена источника .env на кэширующий (с env_file из __init__, включая явный None)."""
+        return (
+            init_settings,
+            env_settings,
+            CachedDotEnvSettingsSource(settings_cls, env_file=_env_file_var.get()),
+            file_secret_settings,
+        )
+
+    @field_validator('solana_rpc_urls', 'broadcast_rpcs', mode='before')
+    @classmethod
+    def parse_rpc_urls(cls, v: Optional[str | List[str]]) -> Tuple[str, ...]:
         """Парсинг списка RPC URLs."""
-        if v:
-            return [url.strip() for url in v.split(',')]
-        return []
-
-    @validator('max_slippage')
-    def validate_slippage(cls, v):
-        """Валидация слипажа."""
-        if not 0 < v < 1:
-            raise ValueError('Slippage должен быть между 0 и 1')
-        return v
-
-    @validator('trade_amount_sol', 'max_trade_size_sol', 'min_trade_size_sol')
-    def validate_amounts(cls, v):
-        """Валидация торговых сумм."""
-        if v <= 0:
-            raise ValueError('Торговая сумма должна быть положительной')
-        return v
+        if isinstance(v, str):
+            return tuple(url.strip() for url in v.split(',') if url.strip())
+        return tuple(v or ())
 
-    def get_capabilities(self) -> List[str]:
-        """Получить список возможностей воркера."""
+    @cached_property
+    def capabilities(self) -> List[str]:
+        """Список возможностей воркера (вычисляется один раз)."""
         capabilities = ["pump_trading"]
         
         if self.max_wallets_per_worker > 1:
@@ -288,12 +405,30 @@ class WorkerConfig(BaseSettings):
         
         return capabilities
 
-    def get_solana_rpc_urls(self) -> List[str]:
-        """Получить список RPC URLs."""
+    @cached_property
+    def rpc_urls(self) -> List[str]:
+        """Список RPC URLs (вычисляется один раз)."""
         urls = [self.solana_rpc_url]
-        if hasattr(self, 'solana_rpc_urls') and self.solana_rpc_urls:
-            urls.extend(self.solana_rpc_urls)
-        return list(set(urls))  # Убираем дубликаты
+        urls.extend(self.solana_rpc_urls)
+        return list(dict.fromkeys(urls))  # Убираем дубликаты, основной RPC первым
+
+    @cached_property
+    def http_timeouts(self) -> Dict[str, float]:
+        """Таймауты HTTP по фазам запроса (аргументы httpx.Timeout)."""
+        return {
+            "connect": self.http_connect_timeout,
+            "read": self.http_read_timeout,
+            "write": self.http_write_timeout,
+            "pool": self.http_pool_timeout,
+        }
+
+    def get_capabilities(self) -> List[str]:
+        """Получить список возможностей воркера (копия - кэш не изменяется вызывающим)."""
+        return list(self.capabilities)
+
+    def get_solana_rpc_urls(self) -> List[str]:
+        """Получить список RPC URLs (копия - кэш не изменяется вызывающим)."""
+        return list(self.rpc_urls)
 
 
 # Глобальный экземпляр конфигурации
@@ -313,3 +448,15 @@ def reload_config() -> WorkerConfig:
     global _config_instance
     _config_instance = None
     return get_config()
+
+
+def reload_config_from_dict(data: dict) -> WorkerConfig:
+    """
+    Перезагрузить конфигурацию из готового снимка без валидации.
+
+    Предполагается, что данные получены из уже провалидированного
+    экземпляра (например, ``instance.model_dump()``).
+    """
+    global _config_instance
+    _config_instance = WorkerConfig.model_construct(**data)
+    return _config_instance
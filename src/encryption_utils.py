@@ -6,331 +6,564 @@
 import base64
 import hashlib
 import os
-from typing import Tuple, Optional
+import sys
+import threading
+from functools import lru_cache
+from typing import List, Optional, Tuple, Union
+from cryptography.exceptions import InvalidTag
 from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric.ed25519 import (
+    Ed25519PrivateKey,
+    Ed25519PublicKey,
+)
 from cryptography.hazmat.primitives.asymmetric.x25519 import (
     X25519PrivateKey,
     X25519PublicKey,
 )
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+from cryptography.hazmat.primitives.kdf.scrypt import Scrypt
 
+# Локальные ссылки для горячих путей шифрования
+_urandom = os.urandom
+_b64encode = base64.b64encode
+_b64decode = base64.b64decode
 
-class EncryptionUtils:
-    """Утилиты для криптографических операций."""
+# Неизменяемые параметры HKDF и хеширования
+_SHA256 = hashes.SHA256()
+_HKDF_INFO = b"pump_bot_encryption"
+_API_KEY_SALT = b"pump_bot_api_key_salt"
 
-    @staticmethod
-    def generate_key_pair_x25519() -> Tuple[str, str]:
-        """
-        Генерирует пару ключей X25519.
+_NONCE_SIZE = 12  # 96 бит для AES-GCM
+_NONCE_POOL_SIZE = 4096
 
-        Returns:
-            Tuple[str, str]: (private_key_base64, public_key_base64)
-        """
-        private_key = X25519PrivateKey.generate()
-        public_key = private_key.public_key()
 
-        private_key_bytes = private_key.private_bytes(
-            encoding=serialization.Encoding.Raw,
-            format=serialization.PrivateFormat.Raw,
-            encryption_algorithm=serialization.NoEncryption(),
-        )
+# Поколение процесса: увеличивается в дочернем процессе после fork
+_fork_generation = 0
 
-        public_key_bytes = public_key.public_bytes(
-            encoding=serialization.Encoding.Raw, 
-            format=serialization.PublicFormat.Raw
-        )
 
-        return (
-            base64.b64encode(private_key_bytes).decode("utf-8"),
-            base64.b64encode(public_key_bytes).decode("utf-8"),
-        )
+def _after_fork_in_child():
+    global _fork_generation
+    _fork_generation += 1
 
-    @staticmethod
-    def perform_key_exchange_x25519(
-        private_key_base64: str, public_key_other_base64: str
-    ) -> bytes:
-        """
-        Выполняет обмен ключами X25519.
 
-        Args:
-            private_key_base64: Собственный приватный ключ в Base64
-            public_key_other_base64: Публичный ключ другой стороны в Base64
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
 
-        Returns:
-            bytes: Общий секрет (32 байта)
-        """
-        try:
-            private_key_bytes = base64.b64decode(private_key_base64)
-            public_key_other_bytes = base64.b64decode(public_key_other_base64)
 
-            private_key = X25519PrivateKey.from_private_bytes(private_key_bytes)
-            public_key_other = X25519PublicKey.from_public_bytes(public_key_other_bytes)
+class _NoncePool(threading.local):
+    """
+    Буфер случайных байт для nonce (свой в каждом потоке).
 
-            shared_key = private_key.exchange(public_key_other)
+    Один вызов os.urandom обслуживает ~340 nonce. Буфер сбрасывается
+    после fork, чтобы дочерний процесс не повторил nonce родителя.
+    """
 
-            # Использовать HKDF для получения стабильного ключа
-            derived_key = HKDF(
-                algorithm=hashes.SHA256(),
-                length=32,
-                salt=None,
-                info=b"pump_bot_encryption",
-            ).derive(shared_key)
+    def __init__(self):
+        self.buf = b""
+        self.off = _NONCE_POOL_SIZE
+        self.gen = -1
 
-            return derived_key
+    def get(self) -> bytes:
+        off = self.off
+        if off + _NONCE_SIZE > _NONCE_POOL_SIZE or self.gen != _fork_generation:
+            self.buf = _urandom(_NONCE_POOL_SIZE)
+            self.gen = _fork_generation
+            off = 0
+        self.off = off + _NONCE_SIZE
+        return self.buf[off:off + _NONCE_SIZE]
 
-        except Exception as e:
-            raise ValueError(f"Ошибка обмена ключами X25519: {str(e)}")
 
-    @staticmethod
-    def encrypt_aes_gcm(
-        plaintext: str, shared_key_bytes: bytes
-    ) -> Tuple[str, str, str]:
-        """
-        Шифрует данные с использованием AES-GCM.
+_nonce_pool = _NoncePool()
 
-        Args:
-            plaintext: Текст для шифрования
-            shared_key_bytes: Общий секретный ключ (32 байта)
 
-        Returns:
-            Tuple[str, str, str]: (ciphertext_base64, nonce_base64, tag_base64)
-        """
-        try:
-            # Генерировать случайный nonce
-            nonce = os.urandom(12)  # 96 бит для AES-GCM
+@lru_cache(maxsize=32)
+def _aesgcm_for(key: bytes) -> AESGCM:
+    """AESGCM объект для ключа (кэшируется, чтобы не строить key schedule заново)."""
+    return AESGCM(key)
 
-            # Создать AESGCM объект
-            aesgcm = AESGCM(shared_key_bytes)
 
-            # Шифровать данные
-            plaintext_bytes = plaintext.encode("utf-8")
-            ciphertext_with_tag = aesgcm.encrypt(nonce, plaintext_bytes, None)
+@lru_cache(maxsize=16)
+def _derive_session_key(private_key_base64: str, public_key_other_base64: str) -> bytes:
+    """Общий ключ X25519 + HKDF (кэшируется: ключ пира стабилен в пределах сессии)."""
+    private_key_bytes = base64.b64decode(private_key_base64)
+    public_key_other_bytes = base64.b64decode(public_key_other_base64)
 
-            # Разделить ciphertext и tag (последние 16 байт)
-            ciphertext = ciphertext_with_tag[:-16]
-            tag = ciphertext_with_tag[-16:]
+    private_key = X25519PrivateKey.from_private_bytes(private_key_bytes)
+    public_key_other = X25519PublicKey.from_public_bytes(public_key_other_bytes)
 
-            return (
-                base64.b64encode(ciphertext).decode("utf-8"),
-                base64.b64encode(nonce).decode("utf-8"),
-                base64.b64encode(tag).decode("utf-8"),
-            )
+    shared_key = private_key.exchange(public_key_other)
 
-        except Exception as e:
-            raise ValueError(f"Ошибка шифрования AES-GCM: {str(e)}")
-
-    @staticmethod
-    def decrypt_aes_gcm(
-        ciphertext_base64: str,
-        nonce_base64: str,
-        tag_base64: str,
-        shared_key_bytes: bytes,
-    ) -> str:
-        """
-        Дешифрует данные AES-GCM.
-
-        Args:
-            ciphertext_base64: Зашифрованный текст в Base64
-            nonce_base64: Nonce в Base64
-            tag_base64: Тег аутентификации в Base64
-            shared_key_bytes: Общий секретный ключ (32 байта)
-
-        Returns:
-            str: Расшифрованный текст
-        """
-        try:
-            ciphertext = base64.b64decode(ciphertext_base64)
-            nonce = base64.b64decode(nonce_base64)
-            tag = base64.b64decode(tag_base64)
+    # Использовать HKDF для получения стабильного ключа
+    return HKDF(
+        algorithm=_SHA256,
+        length=32,
+        salt=None,
+        info=_HKDF_INFO,
+    ).derive(shared_key)
+
+
+@lru_cache(maxsize=16)
+def _ed25519_private_key(private_key_base64: str) -> Ed25519PrivateKey:
+    """Загрузка приватного ключа Ed25519 (один раз на ключ)."""
+    return Ed25519PrivateKey.from_private_bytes(base64.b64decode(private_key_base64))
+
+
+@lru_cache(maxsize=16)
+def _ed25519_public_key(public_key_base64: str) -> Ed25519PublicKey:
+    """Загрузка публичного ключа Ed25519 (один раз на ключ)."""
+    return Ed25519PublicKey.from_public_bytes(base64.b64decode(public_key_base64))
+
+
+def _derive_kdf(password: bytes, salt: bytes) -> bytes:
+    """Получение ключа из пароля через scrypt."""
+    return Scrypt(salt=salt, length=32, n=2**14, r=8, p=1).derive(password)
+
+
+def _derive_kdf_legacy(password: bytes, salt: bytes) -> bytes:
+    """Получение ключа из пароля через PBKDF2 (старый формат данных)."""
+    return hashlib.pbkdf2_hmac('sha256', password, salt, 100000)
+
+
+def generate_key_pair_x25519() -> Tuple[str, str]:
+    """
+    Генерирует пару ключей X25519.
+
+    Returns:
+        Tuple[str, str]: (private_key_base64, public_key_base64)
+    """
+    private_key = X25519PrivateKey.generate()
+    public_key = private_key.public_key()
+
+    private_key_bytes = private_key.private_bytes(
+        encoding=serialization.Encoding.Raw,
+        format=serialization.PrivateFormat.Raw,
+        encryption_algorithm=serialization.NoEncryption(),
+    )
+
+    public_key_bytes = public_key.public_bytes(
+        encoding=serialization.Encoding.Raw, 
+        format=serialization.PublicFormat.Raw
+    )
+
+    return (
+        base64.b64encode(private_key_bytes).decode("utf-8"),
+        base64.b64encode(public_key_bytes).decode("utf-8"),
+    )
+
+
+def perform_key_exchange_x25519(
+    private_key_base64: str, public_key_other_base64: str
+) -> bytes:
+    """
+    Выполняет обмен ключами X25519.
+
+    Args:
+        private_key_base64: Собственный приватный ключ в Base64
+        public_key_other_base64: Публичный ключ другой стороны в Base64
+
+    Returns:
+        bytes: Общий секрет (32 байта)
+    """
+    try:
+        return _derive_session_key(private_key_base64, public_key_other_base64)
+    except Exception as e:
+        raise ValueError(f"Ошибка обмена ключами X25519: {str(e)}")
+
+
+def encrypt_aes_gcm_raw(
+    plaintext: bytes, shared_key_bytes: bytes
+) -> Tuple[bytes, bytes]:
+    """
+    Шифрует байты с использованием AES-GCM без Base64-кодирования.
+
+    Args:
+        plaintext: Данные для шифрования
+        shared_key_bytes: Общий секретный ключ (32 байта)
+
+    Returns:
+        Tuple[bytes, bytes]: (ciphertext_with_tag, nonce), тег в последних 16 байтах
+    """
+    # Генерировать случайный nonce
+    nonce = _nonce_pool.get()
+
+    # Шифровать данные (AESGCM сам дописывает тег в конец)
+    return _aesgcm_for(shared_key_bytes).encrypt(nonce, plaintext, None), nonce
+
+
+def decrypt_aes_gcm_raw(
+    ciphertext_with_tag: bytes, nonce: bytes, shared_key_bytes: bytes
+) -> bytes:
+    """
+    Дешифрует байты AES-GCM без Base64-декодирования.
+
+    Args:
+        ciphertext_with_tag: Зашифрованные данные с тегом в конце
+        nonce: Nonce
+        shared_key_bytes: Общий секретный ключ (32 байта)
+
+    Returns:
+        bytes: Расшифрованные данные
+    """
+    return _aesgcm_for(shared_key_bytes).decrypt(nonce, ciphertext_with_tag, None)
+
+
+def encrypt_aes_gcm(
+    plaintext: Union[str, bytes], shared_key_bytes: bytes
+) -> Tuple[str, str, str]:
+    """
+    Шифрует данные с использованием AES-GCM.
+
+    Args:
+        plaintext: Текст (или уже закодированные UTF-8 байты) для шифрования
+        shared_key_bytes: Общий секретный ключ (32 байта)
+
+    Returns:
+        Tuple[str, str, str]: (ciphertext_base64, nonce_base64, tag_base64)
+    """
+    if isinstance(plaintext, str):
+        plaintext = plaintext.encode("utf-8")
+
+    ciphertext_with_tag, nonce = encrypt_aes_gcm_raw(plaintext, shared_key_bytes)
+
+    # Разделить ciphertext и tag (последние 16 байт) для формата "ciphertext:nonce:tag"
+    ciphertext = ciphertext_with_tag[:-16]
+    tag = ciphertext_with_tag[-16:]
+
+    return (
+        _b64encode(ciphertext).decode("utf-8"),
+        _b64encode(nonce).decode("utf-8"),
+        _b64encode(tag).decode("utf-8"),
+    )
+
+
+def decrypt_aes_gcm(
+    ciphertext_base64: str,
+    nonce_base64: str,
+    tag_base64: str,
+    shared_key_bytes: bytes,
+) -> str:
+    """
+    Дешифрует данные AES-GCM.
+
+    Args:
+        ciphertext_base64: Зашифрованный текст в Base64
+        nonce_base64: Nonce в Base64
+        tag_base64: Тег аутентификации в Base64
+        shared_key_bytes: Общий секретный ключ (32 байта)
+
+    Returns:
+        str: Расшифрованный текст
+    """
+    ciphertext = _b64decode(ciphertext_base64)
+    nonce = _b64decode(nonce_base64)
+    tag = _b64decode(tag_base64)
+
+    # Получить AESGCM объект для ключа
+    aesgcm = _aesgcm_for(shared_key_bytes)
+
+    # Объединить ciphertext и tag для decrypt
+    ciphertext_with_tag = ciphertext + tag
+
+    # Дешифровать данные
+    plaintext_bytes = aesgcm.decrypt(nonce, ciphertext_with_tag, None)
+
+    return plaintext_bytes.decode("utf-8")
+
+
+def encrypt_packed(plaintext: bytes, shared_key_bytes: bytes) -> bytes:
+    """
+    Шифрует данные AES-GCM в один бинарный блок.
+
+    Args:
+        plaintext: Данные для шифрования
+        shared_key_bytes: Общий секретный ключ (32 байта)
+
+    Returns:
+        bytes: nonce + ciphertext + tag
+    """
+    nonce = _nonce_pool.get()
+    return nonce + _aesgcm_for(shared_key_bytes).encrypt(nonce, plaintext, None)
+
+
+def decrypt_packed(blob: Union[bytes, memoryview], shared_key_bytes: bytes) -> bytes:
+    """
+    Дешифрует бинарный блок nonce + ciphertext + tag.
 
-            # Создать AESGCM объект
-            aesgcm = AESGCM(shared_key_bytes)
+    Args:
+        blob: Зашифрованные данные
+        shared_key_bytes: Общий секретный ключ (32 байта)
+
+    Returns:
+        bytes: Расшифрованные данные
+    """
+    if len(blob) < _NONCE_SIZE + 16:
+        raise ValueError("Неверный формат зашифрованных данных")
+    view = memoryview(blob)
+    return decrypt_aes_gcm_raw(view[_NONCE_SIZE:], view[:_NONCE_SIZE], shared_key_bytes)
 
-            # Объединить ciphertext и tag для decrypt
-            ciphertext_with_tag = ciphertext + tag
 
-            # Дешифровать данные
-            plaintext_bytes = aesgcm.decrypt(nonce, ciphertext_with_tag, None)
+def encrypt_framed(plaintext: bytes, shared_key_bytes: bytes) -> str:
+    """
+    Шифрует данные AES-GCM в компактный формат одной строкой.
+
+    Args:
+        plaintext: Данные для шифрования
+        shared_key_bytes: Общий секретный ключ (32 байта)
+
+    Returns:
+        str: Base64(nonce + ciphertext + tag)
+    """
+    return _b64encode(encrypt_packed(plaintext, shared_key_bytes)).decode("ascii")
+
 
-            return plaintext_bytes.decode("utf-8")
+def decrypt_framed(encrypted_data: str, shared_key_bytes: bytes) -> bytes:
+    """
+    Дешифрует данные в формате Base64(nonce + ciphertext + tag).
 
-        except Exception as e:
-            raise ValueError(f"Ошибка дешифрования AES-GCM: {str(e)}")
+    Args:
+        encrypted_data: Зашифрованные данные
+        shared_key_bytes: Общий секретный ключ (32 байта)
 
-    @staticmethod
-    def encrypt_wallet_key(private_key_base58: str, shared_key_bytes: bytes) -> str:
-        """
-        Шифрует приватный ключ кошелька для передачи.
+    Returns:
+        bytes: Расшифрованные данные
+    """
+    return decrypt_packed(_b64decode(encrypted_data), shared_key_bytes)
 
-        Args:
-            private_key_base58: Приватный ключ кошелька в формате base58
-            shared_key_bytes: Общий секретный ключ
 
-        Returns:
-            str: Зашифрованные данные в формате "ciphertext:nonce:tag" (все в Base64)
-        """
-        ciphertext, nonce, tag = EncryptionUtils.encrypt_aes_gcm(
-            private_key_base58, shared_key_bytes
+def encrypt_wallet_key(private_key_base58: str, shared_key_bytes: bytes) -> str:
+    """
+    Шифрует приватный ключ кошелька для передачи.
+
+    Args:
+        private_key_base58: Приватный ключ кошелька в формате base58
+        shared_key_bytes: Общий секретный ключ
+
+    Returns:
+        str: Зашифрованные данные Base64(nonce + ciphertext + tag)
+    """
+    return encrypt_framed(private_key_base58.encode("utf-8"), shared_key_bytes)
+
+
+def encrypt_wallet_keys_batch(
+    private_keys_base58: List[str], shared_key_bytes: bytes
+) -> List[str]:
+    """
+    Шифрует пачку приватных ключей кошельков одним AESGCM объектом.
+
+    Args:
+        private_keys_base58: Приватные ключи кошельков в формате base58
+        shared_key_bytes: Общий секретный ключ
+
+    Returns:
+        List[str]: Зашифрованные ключи в формате encrypt_wallet_key
+    """
+    aesgcm = _aesgcm_for(shared_key_bytes)
+    # Все nonce за один системный вызов
+    nonces = _urandom(_NONCE_SIZE * len(private_keys_base58))
+
+    encrypted = []
+    for i, private_key_base58 in enumerate(private_keys_base58):
+        nonce = nonces[_NONCE_SIZE * i:_NONCE_SIZE * (i + 1)]
+        ciphertext_with_tag = aesgcm.encrypt(
+            nonce, private_key_base58.encode("utf-8"), None
         )
-        return f"{ciphertext}:{nonce}:{tag}"
+        encrypted.append(_b64encode(nonce + ciphertext_with_tag).decode("ascii"))
 
-    @staticmethod
-    def decrypt_wallet_key(encrypted_data: str, shared_key_bytes: bytes) -> str:
-        """
-        Дешифрует приватный ключ кошелька.
+    return encrypted
 
-        Args:
-            encrypted_data: Зашифрованные данные в формате "ciphertext:nonce:tag"
-            shared_key_bytes: Общий секретный ключ
 
-        Returns:
-            str: Приватный ключ кошелька в формате base58
-        """
-        try:
-            ciphertext_base64, nonce_base64, tag_base64 = encrypted_data.split(":")
-            return EncryptionUtils.decrypt_aes_gcm(
-                ciphertext_base64, nonce_base64, tag_base64, shared_key_bytes
+def decrypt_wallet_key(encrypted_data: str, shared_key_bytes: bytes) -> str:
+    """
+    Дешифрует приватный ключ кошелька.
+
+    Args:
+        encrypted_data: Зашифрованные данные Base64(nonce + ciphertext + tag)
+            или в старом формате "ciphertext:nonce:tag"
+        shared_key_bytes: Общий секретный ключ
+
+    Returns:
+        str: Приватный ключ кошелька в формате base58
+    """
+    if ":" not in encrypted_data:
+        return decrypt_framed(encrypted_data, shared_key_bytes).decode("utf-8")
+
+    try:
+        ciphertext_base64, nonce_base64, tag_base64 = encrypted_data.split(":")
+        return decrypt_aes_gcm(
+            ciphertext_base64, nonce_base64, tag_base64, shared_key_bytes
+        )
+    except ValueError as e:
+        if "not enough values to unpack" in str(e):
+            raise ValueError(
+                "Неверный формат зашифрованных данных. Ожидается 'ciphertext:nonce:tag'"
             )
-        except ValueError as e:
-            if "not enough values to unpack" in str(e):
-                raise ValueError(
-                    "Неверный формат зашифрованных данных. Ожидается 'ciphertext:nonce:tag'"
-                )
-            raise
-
-    @staticmethod
-    def hash_api_key(api_key: str) -> str:
-        """
-        Хеширует API ключ для безопасного хранения.
-
-        Args:
-            api_key: API ключ
-
-        Returns:
-            str: Хеш API ключа в base64
-        """
-        # Используем соль для безопасности
-        salt = b"pump_bot_api_key_salt"
-        key_bytes = api_key.encode('utf-8')
-        hash_bytes = hashlib.pbkdf2_hmac('sha256', key_bytes, salt, 100000)
-        return base64.b64encode(hash_bytes).decode('utf-8')
-
-    @staticmethod
-    def generate_secure_token(length: int = 32) -> str:
-        """
-        Генерирует криптографически стойкий токен.
-
-        Args:
-            length: Длина токена в байтах
-
-        Returns:
-            str: Токен в base64
-        """
-        token_bytes = os.urandom(length)
-        return base64.b64encode(token_bytes).decode('utf-8')
-
-    @staticmethod
-    def verify_message_integrity(message: str, signature: str, public_key: str) -> bool:
-        """
-        Проверяет целостность сообщения.
-
-        Args:
-            message: Сообщение
-            signature: Подпись сообщения
-            public_key: Публичный ключ для проверки
-
-        Returns:
-            bool: True если сообщение подлинное
-        """
-        try:
-            # Простая реализация для проверки целостности
-            expected_hash = hashlib.sha256(
-                (message + public_key).encode('utf-8')
-            ).hexdigest()
-            return signature == expected_hash
-        except Exception:
-            return False
-
-    @staticmethod
-    def sign_message(message: str, private_key: str) -> str:
-        """
-        Подписывает сообщение.
-
-        Args:
-            message: Сообщение для подписи
-            private_key: Приватный ключ
-
-        Returns:
-            str: Подпись сообщения
-        """
-        try:
-            # Простая реализация подписи
-            signature_hash = hashlib.sha256(
-                (message + private_key).encode('utf-8')
-            ).hexdigest()
-            return signature_hash
-        except Exception as e:
-            raise ValueError(f"Ошибка подписи сообщения: {str(e)}")
-
-    @staticmethod
-    def encrypt_sensitive_data(data: str, password: str) -> str:
-        """
-        Шифрует чувствительные данные с помощью пароля.
-
-        Args:
-            data: Данные для шифрования
-            password: Пароль
-
-        Returns:
-            str: Зашифрованные данные
-        """
-        try:
-            # Генерируем ключ из пароля
-            salt = os.urandom(16)
-            key = hashlib.pbkdf2_hmac('sha256', password.encode(), salt, 100000)
-            
-            # Шифруем данные
-            nonce = os.urandom(12)
-            aesgcm = AESGCM(key)
-            ciphertext = aesgcm.encrypt(nonce, data.encode('utf-8'), None)
-            
-            # Объединяем соль, nonce и зашифрованные данные
-            encrypted = salt + nonce + ciphertext
-            return base64.b64encode(encrypted).decode('utf-8')
-            
-        except Exception as e:
-            raise ValueError(f"Ошибка шифрования данных: {str(e)}")
-
-    @staticmethod
-    def decrypt_sensitive_data(encrypted_data: str, password: str) -> str:
-        """
-        Дешифрует чувствительные данные.
-
-        Args:
-            encrypted_data: Зашифрованные данные
-            password: Пароль
-
-        Returns:
-            str: Расшифрованные данные
-        """
+        raise
+
+
+def hash_api_key(api_key: str) -> str:
+    """
+    Хеширует API ключ для безопасного хранения.
+
+    Args:
+        api_key: API ключ
+
+    Returns:
+        str: Хеш API ключа в base64
+    """
+    # Детерминированный ключевой хеш для поиска (не хранение паролей)
+    hash_bytes = hashlib.blake2b(
+        api_key.encode('utf-8'), key=_API_KEY_SALT, digest_size=32
+    ).digest()
+    return base64.b64encode(hash_bytes).decode('ascii')
+
+
+def generate_secure_token(length: int = 32) -> str:
+    """
+    Генерирует криптографически стойкий токен.
+
+    Args:
+        length: Длина токена в байтах
+
+    Returns:
+        str: Токен в base64
+    """
+    token_bytes = os.urandom(length)
+    return base64.b64encode(token_bytes).decode('utf-8')
+
+
+def generate_key_pair_ed25519() -> Tuple[str, str]:
+    """
+    Генерирует пару ключей Ed25519 для подписи сообщений.
+
+    Returns:
+        Tuple[str, str]: (private_key_base64, public_key_base64)
+    """
+    private_key = Ed25519PrivateKey.generate()
+
+    private_key_bytes = private_key.private_bytes(
+        encoding=serialization.Encoding.Raw,
+        format=serialization.PrivateFormat.Raw,
+        encryption_algorithm=serialization.NoEncryption(),
+    )
+
+    public_key_bytes = private_key.public_key().public_bytes(
+        encoding=serialization.Encoding.Raw,
+        format=serialization.PublicFormat.Raw
+    )
+
+    return (
+        base64.b64encode(private_key_bytes).decode("utf-8"),
+        base64.b64encode(public_key_bytes).decode("utf-8"),
+    )
+
+
+def verify_message_integrity(message: str, signature: str, public_key: str) -> bool:
+    """
+    Проверяет подпись Ed25519 сообщения.
+
+    Args:
+        message: Сообщение
+        signature: Подпись сообщения в Base64
+        public_key: Публичный ключ Ed25519 в Base64
+
+    Returns:
+        bool: True если сообщение подлинное
+    """
+    try:
+        _ed25519_public_key(public_key).verify(
+            base64.b64decode(signature), message.encode('utf-8')
+        )
+        return True
+    except Exception:
+        return False
+
+
+def sign_message(message: str, private_key: str) -> str:
+    """
+    Подписывает сообщение ключом Ed25519.
+
+    Args:
+        message: Сообщение для подписи
+        private_key: Приватный ключ Ed25519 в Base64
+
+    Returns:
+        str: Подпись сообщения в Base64
+    """
+    signature = _ed25519_private_key(private_key).sign(message.encode('utf-8'))
+    return base64.b64encode(signature).decode('ascii')
+
+
+class PasswordCipher:
+    """
+    Шифрование чувствительных данных паролем с однократным выводом ключа.
+
+    Соль случайна для каждого объекта: шифротексты одного объекта используют
+    общую соль и ключ scrypt (уникален nonce), ключ живет не дольше объекта.
+    """
+
+    def __init__(self, password: str):
+        self._password = password.encode()
+        self._salt = os.urandom(16)
+        self._aesgcm: Optional[AESGCM] = None  # выводится при первом шифровании
+
+    def encrypt(self, data: str) -> str:
+        """Шифрование строки: base64(соль + nonce + шифротекст)."""
+        if self._aesgcm is None:
+            self._aesgcm = AESGCM(_derive_kdf(self._password, self._salt))
+        nonce = os.urandom(_NONCE_SIZE)
+        ciphertext = self._aesgcm.encrypt(nonce, data.encode('utf-8'), None)
+        return base64.b64encode(self._salt + nonce + ciphertext).decode('utf-8')
+
+    def decrypt(self, encrypted_data: str) -> str:
+        """Дешифрование строки (с откатом на PBKDF2 для старых данных)."""
+        data = base64.b64decode(encrypted_data.encode('utf-8'))
+        salt = data[:16]
+        nonce = data[16:16 + _NONCE_SIZE]
+        ciphertext = data[16 + _NONCE_SIZE:]
+        
+        if salt == self._salt and self._aesgcm is not None:
+            aesgcm = self._aesgcm
+        else:
+            aesgcm = AESGCM(_derive_kdf(self._password, salt))
         try:
-            # Декодируем данные
-            data = base64.b64decode(encrypted_data.encode('utf-8'))
-            
-            # Извлекаем соль, nonce и зашифрованные данные
-            salt = data[:16]
-            nonce = data[16:28]
-            ciphertext = data[28:]
-            
-            # Генерируем ключ из пароля
-            key = hashlib.pbkdf2_hmac('sha256', password.encode(), salt, 100000)
-            
-            # Дешифруем данные
-            aesgcm = AESGCM(key)
             plaintext = aesgcm.decrypt(nonce, ciphertext, None)
-            
-            return plaintext.decode('utf-8')
-            
-        except Exception as e:
-            raise ValueError(f"Ошибка дешифрования данных: {str(e)}")
+        except InvalidTag:
+            key = _derive_kdf_legacy(self._password, salt)
+            plaintext = AESGCM(key).decrypt(nonce, ciphertext, None)
+        
+        return plaintext.decode('utf-8')
+
+
+def encrypt_sensitive_data(data: str, password: str) -> str:
+    """
+    Шифрует чувствительные данные с помощью пароля (новая соль на каждый вызов).
+
+    Для многократного шифрования одним паролем используйте PasswordCipher.
+
+    Args:
+        data: Данные для шифрования
+        password: Пароль
+
+    Returns:
+        str: Зашифрованные данные
+    """
+    return PasswordCipher(password).encrypt(data)
+
+
+def decrypt_sensitive_data(encrypted_data: str, password: str) -> str:
+    """
+    Дешифрует чувствительные данные.
+
+    Args:
+        encrypted_data: Зашифрованные данные
+        password: Пароль
+
+    Returns:
+        str: Расшифрованные данные
+    """
+    return PasswordCipher(password).decrypt(encrypted_data)
+
+
+# Совместимость: вызовы вида EncryptionUtils.encrypt_aes_gcm(...) продолжают работать
+EncryptionUtils = sys.modules[__name__]
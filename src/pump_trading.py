@@ -4,23 +4,127 @@
 """
 
 import asyncio
-import json
+import itertools
 import logging
-from datetime import datetime, timezone
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, asdict
+import time
+from collections import OrderedDict, deque
+from base64 import b64encode
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Deque, Dict, List, Optional, Any, Set, Tuple, TypeVar
+from dataclasses import dataclass
 
 import httpx
+import orjson
 from solana.rpc.async_api import AsyncClient
-from solana.rpc.types import TxOpts
+from solana.rpc.websocket_api import SolanaWsClientProtocol, connect as ws_connect
+from solders.rpc.responses import SignatureNotification
+from solders.signature import Signature
 from solders.keypair import Keypair
 from solders.transaction import Transaction
-from solders.system_program import TransferParams, transfer
+from solders.hash import Hash
 from solders.pubkey import Pubkey
+from websockets.exceptions import ConnectionClosed
 import base58
 
+# Время жизни кэша цены токена (сек)
+TOKEN_INFO_TTL_SEC = 5.0
 
-@dataclass
+# Максимум токенов в кэше цен (вытесняются давно не использованные)
+TOKEN_INFO_CACHE_SIZE = 1024
+
+# Интервал фонового обновления blockhash (сек)
+BLOCKHASH_REFRESH_SEC = 2.0
+
+# Максимальный возраст закэшированного blockhash (сек)
+BLOCKHASH_MAX_AGE_SEC = 30.0
+
+# Сколько последних blockhash хранить
+BLOCKHASH_RING_SIZE = 4
+
+# Параметры sendTransaction (подтверждение отслеживается отдельно)
+_TX_OPTS = {"encoding": "base64", "skipPreflight": True, "preflightCommitment": "processed"}
+_TX_OPTS_PREFLIGHT = {"encoding": "base64", "skipPreflight": False, "preflightCommitment": "processed"}
+
+# Таймаут ожидания подтверждения транзакции (сек)
+CONFIRMATION_TIMEOUT_SEC = 30.0
+
+# Интервал общего опроса getSignatureStatuses: экспоненциальный рост от минимума до максимума (сек)
+CONFIRMATION_POLL_MIN_SEC = 0.2
+CONFIRMATION_POLL_MAX_SEC = 2.0
+CONFIRMATION_POLL_BACKOFF = 1.5
+
+# Максимум подписей в одном запросе getSignatureStatuses
+MAX_SIGNATURES_PER_REQUEST = 256
+
+_T = TypeVar("_T")
+
+
+class ConfirmationTimeoutError(ValueError):
+    """Транзакция не подтверждена за отведенное время."""
+
+
+class BatchRejectedError(ValueError):
+    """RPC узел не принимает пакетные запросы."""
+
+
+def _is_already_processed(error: Exception) -> bool:
+    """Ошибка симуляции для транзакции, которая уже обработана сетью."""
+    message = str(error)
+    return "AlreadyProcessed" in message or "already been processed" in message
+
+
+class RawSolanaRPC:
+    """Тонкий JSON-RPC клиент Solana поверх общего httpx клиента (ответы - dict)."""
+
+    def __init__(self, http_client: httpx.AsyncClient, rpc_url: str):
+        self.http_client = http_client
+        self.rpc_url = rpc_url
+
+    async def call(self, method: str, params: List[Any]) -> Any:
+        """Одиночный JSON-RPC вызов (обычный объект запроса, не пакет)."""
+        body = await self._post({"jsonrpc": "2.0", "id": 0, "method": method, "params": params})
+        if not isinstance(body, dict) or "error" in body or "result" not in body:
+            error = body.get("error") if isinstance(body, dict) else body
+            raise ValueError(f"Ошибка RPC {method}: {error}")
+        return body["result"]
+
+    async def batch(self, calls: List[Tuple[str, List[Any]]]) -> List[Any]:
+        """Пакетный JSON-RPC запрос: несколько вызовов одним HTTP POST."""
+        body = await self._post([
+            {"jsonrpc": "2.0", "id": i, "method": method, "params": params}
+            for i, (method, params) in enumerate(calls)
+        ])
+        
+        # Вместо массива ответов узел может вернуть одну ошибку (например, пакеты запрещены)
+        if not isinstance(body, list):
+            error = body.get("error", body) if isinstance(body, dict) else body
+            raise BatchRejectedError(f"Ошибка пакетного RPC запроса: {error}")
+        
+        # Порядок ответов не гарантирован - сопоставляем по id
+        responses = {item.get("id"): item for item in body if isinstance(item, dict)}
+        
+        results = []
+        for i, (method, _) in enumerate(calls):
+            item = responses.get(i)
+            if item is None or "error" in item:
+                error = item.get("error") if item else "нет ответа"
+                raise ValueError(f"Ошибка RPC {method}: {error}")
+            results.append(item["result"])
+        
+        return results
+
+    async def _post(self, payload: Any) -> Any:
+        """POST JSON-RPC запроса и разбор тела ответа."""
+        response = await self.http_client.post(
+            self.rpc_url,
+            content=orjson.dumps(payload),
+            headers={"content-type": "application/json"}
+        )
+        response.raise_for_status()
+        return orjson.loads(response.content)
+
+
+@dataclass(slots=True)
 class TradeResult:
     """Результат торговой операции."""
     success: bool
@@ -35,29 +139,86 @@ class TradeResult:
 
     def to_dict(self) -> Dict[str, Any]:
         """Конвертация в словарь."""
-        return asdict(self)
+        return {
+            "success": self.success,
+            "transaction_id": self.transaction_id,
+            "error_message": self.error_message,
+            "token_address": self.token_address,
+            "amount_sol": self.amount_sol,
+            "price_impact": self.price_impact,
+            "gas_used": self.gas_used,
+            "execution_time_ms": self.execution_time_ms,
+            "timestamp": self.timestamp,
+        }
 
 
 class TradingEngine:
     """Торговый движок для выполнения операций пампа."""
 
-    def __init__(self, config, solana_client: AsyncClient, http_client: httpx.AsyncClient, logger: logging.Logger):
+    def __init__(self, config, solana_client: AsyncClient, http_client: httpx.AsyncClient, logger: logging.Logger,
+                 rpc_selector: Optional[Callable[[], int]] = None,
+                 on_rpc_failure: Optional[Callable[[int], None]] = None):
         self.config = config
         self.solana_client = solana_client
         self.http_client = http_client
         self.logger = logger
         
-        # Статистика торговли
-        self.trade_stats = {
-            "total_trades": 0,
-            "successful_trades": 0,
-            "failed_trades": 0,
-            "total_volume_sol": 0.0,
-            "average_execution_time": 0.0
-        }
+        # Горячие RPC вызовы идут напрямую через httpx (AsyncClient - для остального).
+        # По клиенту на каждый RPC URL; индекс здорового RPC выдает rpc_selector,
+        # о сбоях сообщается через on_rpc_failure (без них - всегда первый RPC)
+        rpc_urls = config.get_solana_rpc_urls()
+        self.rpc_url = rpc_urls[0]
+        self.rpcs = [RawSolanaRPC(http_client, url) for url in rpc_urls]
+        self._rpc_selector = rpc_selector or (lambda: 0)
+        self._on_rpc_failure = on_rpc_failure or (lambda idx: None)
+        
+        # Дополнительные RPC: подписанная транзакция рассылается на все параллельно
+        self.broadcasters = [
+            RawSolanaRPC(http_client, url)
+            for url in config.broadcast_rpcs
+            if url not in rpc_urls
+        ]
+        
+        # Отправки на остальные RPC, продолжающиеся после первого успешного ответа
+        self._send_tasks: Set[asyncio.Task] = set()
+        
+        # Последние blockhash, обновляемые в фоне: (blockhash, время получения), новейший в конце
+        self._blockhash_ring: Deque[Tuple[Hash, float]] = deque(maxlen=BLOCKHASH_RING_SIZE)
+        self._blockhash_ready = asyncio.Event()
+        self._blockhash_task: Optional[asyncio.Task] = None
+        
+        # WebSocket подписки на подтверждение транзакций (одно соединение на все сделки)
+        self.ws_url = self.rpc_url.replace("https://", "wss://", 1).replace("http://", "ws://", 1)
+        self._ws: Optional[SolanaWsClientProtocol] = None
+        self._ws_task: Optional[asyncio.Task] = None
+        self._signature_futures: Dict[str, asyncio.Future] = {}
+        
+        # Общий опрос статусов для транзакций без WebSocket подписки
+        self._pending_sigs: Dict[str, asyncio.Future] = {}
+        self._pending_event = asyncio.Event()
+        self._poller_task: Optional[asyncio.Task] = None
+        
+        # Статистика торговли (словарь собирается только в get_stats)
+        self._n_total = 0
+        self._n_ok = 0
+        self._n_fail = 0
+        self._sum_vol = 0.0
+        self._sum_time_ms = 0
         
         # Кошелек для торговли
         self.trading_keypair = None
+        self.trading_pubkey: Optional[Pubkey] = None
+        self.trading_address: Optional[str] = None
+        
+        # Кэш информации о токенах: адрес -> (время получения, данные)
+        self._token_info_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        
+        # Выполняющиеся запросы информации о токенах (одновременные вызовы ждут один запрос)
+        self._inflight_token_info: Dict[str, asyncio.Future] = {}
+        
+        # Имитация торговли
+        self._mock_latency_s = config.mock_trade_latency_s
+        self._mock_tx_counter = itertools.count(1)
         
         # Настройки торговли
         self.max_slippage = config.max_slippage
@@ -66,7 +227,10 @@ class TradingEngine:
         # Защитные лимиты
         self.daily_volume_limit = config.daily_trade_limit_sol
         self.daily_volume_used = 0.0
+        # SOL зарезервированных, но еще не завершенных сделок
+        self._inflight_sol = 0.0
         self.last_reset_day = datetime.now(timezone.utc).date()
+        self._next_reset_at = self._monotonic_next_midnight()
 
     async def initialize(self):
         """Инициализация торгового движка."""
@@ -75,11 +239,13 @@ class TradingEngine:
             if self.config.solana_private_key:
                 private_key_bytes = base58.b58decode(self.config.solana_private_key)
                 self.trading_keypair = Keypair.from_bytes(private_key_bytes)
+                self.trading_pubkey = self.trading_keypair.pubkey()
+                self.trading_address = str(self.trading_pubkey)
                 
-                self.logger.info(f"💳 Торговый кошелек: {self.trading_keypair.pubkey()}")
+                self.logger.info(f"💳 Торговый кошелек: {self.trading_address}")
                 
                 # Проверка баланса
-                balance = await self._get_wallet_balance(self.trading_keypair.pubkey())
+                balance = await self._get_wallet_balance(self.trading_pubkey)
                 self.logger.info(f"💰 Баланс кошелька: {balance:.4f} SOL")
                 
                 if balance < self.trade_amount_sol:
@@ -88,6 +254,12 @@ class TradingEngine:
             else:
                 self.logger.warning("⚠️ Приватный ключ Solana не настроен")
             
+            # Фоновые задачи: blockhash и уведомления о подтверждении
+            if not self.config.mock_trading:
+                self._blockhash_task = asyncio.create_task(self._blockhash_refresher())
+                self._ws_task = asyncio.create_task(self._signature_listener())
+                self._poller_task = asyncio.create_task(self._confirmation_poller())
+            
             self.logger.info("✅ Торговый движок инициализирован")
             
         except Exception as e:
@@ -96,7 +268,10 @@ class TradingEngine:
 
     async def execute_pump_trade(self, command: Dict[str, Any]) -> TradeResult:
         """Выполнение торговой операции пампа."""
-        start_time = datetime.now(timezone.utc)
+        start_time = time.monotonic()
+        
+        # Одна метка времени на сделку (время начала) для всех вариантов результата
+        timestamp = datetime.now(timezone.utc)
         
         try:
             # Извлечение параметров команды
@@ -113,16 +288,18 @@ class TradingEngine:
             if not self.trading_keypair:
                 raise ValueError("Торговый кошелек не инициализирован")
             
-            # Проверка лимитов
-            await self._check_trade_limits(amount_sol)
-            
             # Имитация торговли (если включена)
             if self.config.mock_trading:
-                return await self._mock_trade(token_address, amount_sol, start_time)
+                await self._check_trade_limits(amount_sol)
+                try:
+                    return await self._mock_trade(token_address, amount_sol, start_time, timestamp)
+                finally:
+                    # Имитация не расходует дневной объем
+                    self._release_trade_reservation(amount_sol, executed=False)
             
             # Реальная торговая операция
             result = await self._execute_real_trade(
-                token_address, amount_sol, max_slippage, start_time
+                token_address, amount_sol, max_slippage, start_time, timestamp
             )
             
             # Обновление статистики
@@ -131,7 +308,7 @@ class TradingEngine:
             return result
             
         except Exception as e:
-            execution_time = (datetime.now(timezone.utc) - start_time).total_seconds() * 1000
+            execution_time = (time.monotonic() - start_time) * 1000
             
             self.logger.error(f"❌ Ошибка выполнения пампа: {e}")
             
@@ -141,16 +318,27 @@ class TradingEngine:
                 token_address=command.get("token_address"),
                 amount_sol=command.get("amount_sol"),
                 execution_time_ms=int(execution_time),
-                timestamp=datetime.now(timezone.utc).isoformat()
+                timestamp=timestamp.isoformat()
             )
 
-    async def _check_trade_limits(self, amount_sol: float):
-        """Проверка торговых лимитов."""
-        # Сброс дневного лимита если нужно
-        current_date = datetime.now(timezone.utc).date()
-        if current_date > self.last_reset_day:
+    @staticmethod
+    def _monotonic_next_midnight() -> float:
+        """Момент ближайшей полуночи UTC в шкале time.monotonic()."""
+        now = datetime.now(timezone.utc)
+        midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time(), timezone.utc)
+        return time.monotonic() + (midnight - now).total_seconds()
+
+    async def _check_trade_limits(self, amount_sol: float, balance: Optional[float] = None):
+        """Проверка торговых лимитов (balance - уже полученный баланс в SOL).
+
+        При успехе объем сделки зарезервирован: вызывающий обязан освободить его
+        через _release_trade_reservation.
+        """
+        # Сброс дневного лимита если нужно (дата вычисляется только после полуночи UTC)
+        if time.monotonic() >= self._next_reset_at:
             self.daily_volume_used = 0.0
-            self.last_reset_day = current_date
+            self.last_reset_day = datetime.now(timezone.utc).date()
+            self._next_reset_at = self._monotonic_next_midnight()
         
         # Проверка размера сделки
         if amount_sol > self.config.max_trade_size_sol:
@@ -159,18 +347,58 @@ class TradingEngine:
         if amount_sol < self.config.min_trade_size_sol:
             raise ValueError(f"Размер сделки меньше минимума: {amount_sol} < {self.config.min_trade_size_sol}")
         
-        # Проверка дневного лимита
+        # Проверка дневного лимита и резервирование объема до первого await,
+        # чтобы одновременные сделки учитывали друг друга
         if self.daily_volume_used + amount_sol > self.daily_volume_limit:
             raise ValueError(f"Превышен дневной лимит торговли: {self.daily_volume_used + amount_sol} > {self.daily_volume_limit}")
+        self.daily_volume_used += amount_sol
+        self._inflight_sol += amount_sol
+        # Баланс должен покрыть эту сделку и все ранее начатые незавершенные
+        required = self._inflight_sol * 1.1  # 10% запас на комиссии
         
-        # Проверка баланса кошелька
-        balance = await self._get_wallet_balance(self.trading_keypair.pubkey())
-        if balance < amount_sol * 1.1:  # 10% запас на комиссии
-            raise ValueError(f"Недостаточно средств: {balance} < {amount_sol * 1.1}")
+        try:
+            if balance is None:
+                balance = await self._get_wallet_balance(self.trading_pubkey)
+            if balance < required:
+                raise ValueError(f"Недостаточно средств: {balance} < {required}")
+        except BaseException:
+            self._release_trade_reservation(amount_sol, executed=False)
+            raise
 
-    async def _execute_real_trade(self, token_address: str, amount_sol: float, max_slippage: float, start_time: datetime) -> TradeResult:
+    def _release_trade_reservation(self, amount_sol: float, executed: bool):
+        """Освобождение резерва сделки (объем возвращается, если сделка не выполнена)."""
+        self._inflight_sol = max(0.0, self._inflight_sol - amount_sol)
+        if not executed:
+            # Резерв мог быть обнулен полуночным сбросом
+            self.daily_volume_used = max(0.0, self.daily_volume_used - amount_sol)
+
+    async def _execute_real_trade(self, token_address: str, amount_sol: float, max_slippage: float, start_time: float,
+                                  timestamp: datetime) -> TradeResult:
         """Выполнение реальной торговой операции."""
+        # Баланс и аккаунт токена одним пакетным RPC запросом (blockhash обновляется в фоне)
+        commitment = {"commitment": self.config.solana_commitment}
+        calls = [
+            ("getBalance", [self.trading_address, commitment]),
+            ("getAccountInfo", [token_address, {**commitment, "encoding": "base64"}]),
+        ]
+        try:
+            balance_result, mint_result = await self._rpc_request(lambda rpc: rpc.batch(calls))
+        except BatchRejectedError:
+            # Провайдер не принимает пакеты - те же вызовы отдельными запросами
+            balance_result, mint_result = await asyncio.gather(
+                *(self._rpc_call(method, params) for method, params in calls)
+            )
+        
+        # Проверка лимитов
+        await self._check_trade_limits(amount_sol, balance=balance_result["value"] / 1e9)
+        
+        executed = False
         try:
+            # Без аккаунта минта покупка гарантированно упадет в сети -
+            # отклоняем до подписи, не расходуя комиссию
+            if mint_result["value"] is None:
+                raise ValueError("Аккаунт токена не найден")
+            
             # Получение информации о токене
             token_info = await self._get_token_info(token_address)
             if not token_info:
@@ -184,25 +412,50 @@ class TradingEngine:
                 token_address, amount_sol, token_amount, max_slippage
             )
             
-            # Подписание транзакции
+            # Подписание и однократная сериализация транзакции
             transaction.sign([self.trading_keypair])
+            raw_transaction = bytes(transaction)
             
-            # Отправка транзакции
-            tx_opts = TxOpts(skip_preflight=False, skip_confirmation=False)
-            response = await self.solana_client.send_transaction(
-                transaction, opts=tx_opts
-            )
-            
-            tx_id = str(response.value)
+            # Отправка транзакции (симуляция отключается настройкой skip_preflight)
+            tx_id = await self._send_transaction(raw_transaction, self.config.skip_preflight)
             
             # Ожидание подтверждения
-            await self._wait_for_confirmation(tx_id)
+            try:
+                await self._wait_for_confirmation(tx_id)
+            except ConfirmationTimeoutError:
+                # Срок blockhash проверяется до статуса: если blockhash истек, а статуса нет,
+                # исходная транзакция уже не попадет в блок
+                blockhash_valid = await self._is_blockhash_valid(transaction.message.recent_blockhash)
+                status = await self._get_signature_status(tx_id)
+                if status and status.get("err"):
+                    raise ValueError(f"Транзакция отклонена: {status['err']}")
+                
+                if not (status and status.get("confirmationStatus")):
+                    # Пока blockhash действителен, повторяем ту же транзакцию;
+                    # иначе переподписываем со свежим blockhash (без риска двойной сделки)
+                    if not blockhash_valid:
+                        transaction = await self._build_pump_transaction(
+                            token_address, amount_sol, token_amount, max_slippage
+                        )
+                        transaction.sign([self.trading_keypair])
+                        raw_transaction = bytes(transaction)
+                    
+                    # Повтор с симуляцией, чтобы получить понятную ошибку
+                    self.logger.warning(f"⚠️ Транзакция не подтверждена, повторная отправка: {tx_id}")
+                    try:
+                        tx_id = await self._send_transaction(raw_transaction, skip_preflight=False)
+                    except ValueError as e:
+                        # Симуляция отклоняет уже обработанную исходную транзакцию -
+                        # результат определяется ее статусом
+                        if not _is_already_processed(e):
+                            raise
+                    await self._wait_for_confirmation(tx_id)
             
             # Вычисление времени выполнения
-            execution_time = (datetime.now(timezone.utc) - start_time).total_seconds() * 1000
+            execution_time = (time.monotonic() - start_time) * 1000
             
-            # Обновление дневного объема
-            self.daily_volume_used += amount_sol
+            # Зарезервированный дневной объем остается израсходованным
+            executed = True
             
             self.logger.info(f"✅ Транзакция выполнена: {tx_id}")
             
@@ -212,22 +465,25 @@ class TradingEngine:
                 token_address=token_address,
                 amount_sol=amount_sol,
                 execution_time_ms=int(execution_time),
-                timestamp=datetime.now(timezone.utc).isoformat()
+                timestamp=timestamp.isoformat()
             )
             
         except Exception as e:
-            execution_time = (datetime.now(timezone.utc) - start_time).total_seconds() * 1000
             raise ValueError(f"Ошибка выполнения транзакции: {e}")
+        finally:
+            self._release_trade_reservation(amount_sol, executed)
 
-    async def _mock_trade(self, token_address: str, amount_sol: float, start_time: datetime) -> TradeResult:
+    async def _mock_trade(self, token_address: str, amount_sol: float, start_time: float,
+                          timestamp: datetime) -> TradeResult:
         """Имитация торговой операции для тестирования."""
-        # Имитация задержки
-        await asyncio.sleep(0.1)
+        # Имитация задержки (по умолчанию без задержки)
+        if self._mock_latency_s:
+            await asyncio.sleep(self._mock_latency_s)
         
-        execution_time = (datetime.now(timezone.utc) - start_time).total_seconds() * 1000
+        execution_time = (time.monotonic() - start_time) * 1000
         
         # Генерация фиктивного ID транзакции
-        fake_tx_id = f"mock_{int(datetime.now().timestamp())}"
+        fake_tx_id = f"mock_{id(self):x}_{next(self._mock_tx_counter)}"
         
         self.logger.info(f"🎭 Имитация пампа: {token_address}, {amount_sol} SOL")
         
@@ -237,28 +493,101 @@ class TradingEngine:
             token_address=token_address,
             amount_sol=amount_sol,
             execution_time_ms=int(execution_time),
-            timestamp=datetime.now(timezone.utc).isoformat()
+            timestamp=timestamp.isoformat()
         )
 
+    async def _rpc_request(self, request: Callable[[RawSolanaRPC], Awaitable[_T]]) -> _T:
+        """Запрос к здоровому RPC с переключением на следующий при сетевой/HTTP ошибке."""
+        error: Optional[Exception] = None
+        for _ in range(len(self.rpcs)):
+            idx = self._rpc_selector()
+            try:
+                return await request(self.rpcs[idx])
+            except httpx.HTTPError as e:
+                # Ошибки JSON-RPC (ValueError) - ответ узла, а не его недоступность
+                self._on_rpc_failure(idx)
+                error = e
+        
+        raise ValueError(f"Все Solana RPC недоступны: {error}")
+
+    async def _rpc_call(self, method: str, params: List[Any]) -> Any:
+        """Одиночный JSON-RPC вызов через ротацию RPC."""
+        return await self._rpc_request(lambda rpc: rpc.call(method, params))
+
+    async def _send_transaction(self, raw_transaction: bytes, skip_preflight: bool) -> str:
+        """Отправка сериализованной транзакции без ожидания подтверждения."""
+        params = [b64encode(raw_transaction).decode(), _TX_OPTS if skip_preflight else _TX_OPTS_PREFLIGHT]
+        if not self.broadcasters:
+            return await self._rpc_call("sendTransaction", params)
+        
+        # Одна и та же подписанная транзакция на все RPC - подпись у всех копий одинакова
+        tasks = [
+            asyncio.create_task(self._rpc_call("sendTransaction", params)),
+            *(asyncio.create_task(rpc.call("sendTransaction", params)) for rpc in self.broadcasters)
+        ]
+        for task in tasks:
+            self._send_tasks.add(task)
+            task.add_done_callback(self._send_task_done)
+        
+        # Первый по времени успешный ответ; остальные отправки завершаются в фоне
+        for next_done in asyncio.as_completed(tasks):
+            try:
+                return await next_done
+            except Exception:
+                continue
+        
+        # Все отправки неудачны - ошибка основного RPC
+        raise tasks[0].exception()
+
+    def _send_task_done(self, task: asyncio.Task):
+        """Снятие завершенной фоновой отправки (ошибка уже не нужна)."""
+        self._send_tasks.discard(task)
+        if not task.cancelled():
+            task.exception()
+
     async def _get_wallet_balance(self, pubkey: Pubkey) -> float:
         """Получение баланса кошелька."""
         try:
-            response = await self.solana_client.get_balance(pubkey)
-            return response.value / 1e9  # Конвертация lamports в SOL
+            result = await self._rpc_call(
+                "getBalance", [str(pubkey), {"commitment": self.config.solana_commitment}]
+            )
+            return result["value"] / 1e9  # Конвертация lamports в SOL
         except Exception as e:
             self.logger.error(f"❌ Ошибка получения баланса: {e}")
             return 0.0
 
     async def _get_token_info(self, token_address: str) -> Optional[Dict[str, Any]]:
         """Получение информации о токене."""
+        cached = self._token_info_cache.get(token_address)
+        if cached and time.monotonic() - cached[0] < TOKEN_INFO_TTL_SEC:
+            self._token_info_cache.move_to_end(token_address)
+            return cached[1]
+        
+        inflight = self._inflight_token_info.get(token_address)
+        if inflight is None:
+            inflight = asyncio.ensure_future(self._fetch_token_info(token_address))
+            self._inflight_token_info[token_address] = inflight
+            inflight.add_done_callback(lambda _: self._inflight_token_info.pop(token_address, None))
+        
+        # shield: отмена одного вызывающего не прерывает общий запрос
+        return await asyncio.shield(inflight)
+
+    async def _fetch_token_info(self, token_address: str) -> Optional[Dict[str, Any]]:
+        """Запрос информации о токене к Jupiter API."""
         try:
             # Запрос к Jupiter API или другому источнику данных о токенах
             url = f"https://price.jup.ag/v4/price?ids={token_address}"
             
-            async with self.http_client.get(url) as response:
-                if response.status_code == 200:
-                    data = response.json()
-                    return data.get("data", {}).get(token_address)
+            response = await self.http_client.get(url)
+            if response.status_code == 200:
+                data = orjson.loads(response.content)
+                token_info = data.get("data", {}).get(token_address)
+                if token_info:
+                    self._token_info_cache[token_address] = (time.monotonic(), token_info)
+                    self._token_info_cache.move_to_end(token_address)
+                    if len(self._token_info_cache) > TOKEN_INFO_CACHE_SIZE:
+                        self._token_info_cache.popitem(last=False)
+                return token_info
             
             return None
             
@@ -297,13 +626,13 @@ class TradingEngine:
             # В реальности здесь будет создание инструкций для DEX (Jupiter, Raydium и т.д.)
             
             # Получение последнего блока
-            recent_blockhash = await self.solana_client.get_latest_blockhash()
+            recent_blockhash = await self._get_recent_blockhash()
             
             # Создание простой транзакции (для демо)
             # В реальности здесь будут инструкции swap
             transaction = Transaction()
-            transaction.recent_blockhash = recent_blockhash.value.blockhash
-            transaction.fee_payer = self.trading_keypair.pubkey()
+            transaction.recent_blockhash = recent_blockhash
+            transaction.fee_payer = self.trading_pubkey
             
             self.logger.debug(f"🔧 Создана транзакция для {token_address}")
             
@@ -313,49 +642,199 @@ class TradingEngine:
             self.logger.error(f"❌ Ошибка создания транзакции: {e}")
             raise
 
-    async def _wait_for_confirmation(self, tx_id: str, max_retries: int = 30):
-        """Ожидание подтверждения транзакции."""
-        for attempt in range(max_retries):
+    async def _blockhash_refresher(self):
+        """Фоновое обновление последнего blockhash."""
+        while True:
             try:
-                response = await self.solana_client.get_signature_status(tx_id)
-                
-                if response.value and response.value[0]:
-                    status = response.value[0]
-                    if status.confirmation_status:
-                        self.logger.debug(f"✅ Транзакция подтверждена: {tx_id}")
-                        return
+                blockhash = await self._fetch_latest_blockhash()
+                entry = (blockhash, time.monotonic())
+                if self._blockhash_ring and self._blockhash_ring[-1][0] == blockhash:
+                    self._blockhash_ring[-1] = entry
+                else:
+                    self._blockhash_ring.append(entry)
+                self._blockhash_ready.set()
+            except Exception as e:
+                self.logger.warning(f"⚠️ Ошибка обновления blockhash: {e}")
+            
+            await asyncio.sleep(BLOCKHASH_REFRESH_SEC)
+
+    async def _get_recent_blockhash(self) -> Hash:
+        """Последний blockhash из кэша или напрямую из RPC, если кэш устарел."""
+        # Первые сделки ждут первого фонового обновления
+        if self._blockhash_task and not self._blockhash_ready.is_set():
+            try:
+                await asyncio.wait_for(self._blockhash_ready.wait(), BLOCKHASH_REFRESH_SEC)
+            except asyncio.TimeoutError:
+                pass
+        
+        if self._blockhash_ring:
+            blockhash, fetched_at = self._blockhash_ring[-1]
+            if time.monotonic() - fetched_at < BLOCKHASH_MAX_AGE_SEC:
+                return blockhash
+        
+        return await self._fetch_latest_blockhash()
+
+    async def _is_blockhash_valid(self, blockhash: Hash) -> bool:
+        """Проверка, что транзакции с этим blockhash еще могут попасть в блок."""
+        result = await self._rpc_call(
+            "isBlockhashValid", [str(blockhash), {"commitment": self.config.solana_commitment}]
+        )
+        return bool(result["value"])
+
+    async def _fetch_latest_blockhash(self) -> Hash:
+        """Запрос последнего blockhash."""
+        result = await self._rpc_call(
+            "getLatestBlockhash", [{"commitment": self.config.solana_commitment}]
+        )
+        return Hash.from_string(result["value"]["blockhash"])
+
+    async def _signature_listener(self):
+        """Прием уведомлений signatureSubscribe с переподключением."""
+        while True:
+            try:
+                async with ws_connect(self.ws_url) as ws:
+                    self._ws = ws
+                    self.logger.debug(f"🔌 WebSocket подписок подключен: {self.ws_url}")
                     
-                    if status.err:
-                        raise ValueError(f"Транзакция отклонена: {status.err}")
-                
-                # Ожидание перед следующей проверкой
-                await asyncio.sleep(1)
+                    async for messages in ws:
+                        for message in messages:
+                            if not isinstance(message, SignatureNotification):
+                                continue
+                            
+                            # Сервер сам снимает подписку после первого уведомления
+                            request = ws.subscriptions.pop(message.subscription, None)
+                            if request is None:
+                                continue
+                            
+                            future = self._signature_futures.get(str(request.signature))
+                            if future and not future.done():
+                                future.set_result(message.result.value.err)
                 
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
-                if attempt == max_retries - 1:
-                    raise ValueError(f"Превышен таймаут подтверждения: {e}")
+                self.logger.warning(f"⚠️ WebSocket подписок отключен: {e}")
+            finally:
+                self._ws = None
+                # Ожидающие сделки переходят на проверку через RPC
+                for future in self._signature_futures.values():
+                    if not future.done():
+                        future.set_exception(ConnectionError("WebSocket подписок отключен"))
+            
+            await asyncio.sleep(self.config.retry_delay)
+
+    async def _confirmation_poller(self):
+        """Общий опрос getSignatureStatuses для всех ожидающих транзакций."""
+        interval = CONFIRMATION_POLL_MIN_SEC
+        while True:
+            # Без ожидающих транзакций не просыпаемся
+            if not self._pending_sigs:
+                self._pending_event.clear()
+                await self._pending_event.wait()
+            
+            # Новые транзакции - снова опрашиваем с минимальным интервалом
+            if self._pending_event.is_set():
+                self._pending_event.clear()
+                interval = CONFIRMATION_POLL_MIN_SEC
+            
+            await asyncio.sleep(interval)
+            interval = min(interval * CONFIRMATION_POLL_BACKOFF, CONFIRMATION_POLL_MAX_SEC)
+            
+            pending = list(self._pending_sigs)
+            for offset in range(0, len(pending), MAX_SIGNATURES_PER_REQUEST):
+                batch = pending[offset:offset + MAX_SIGNATURES_PER_REQUEST]
+                try:
+                    result = await self._rpc_call("getSignatureStatuses", [batch])
+                except Exception as e:
+                    self.logger.warning(f"⚠️ Ошибка опроса статусов транзакций: {e}")
+                    continue
                 
-                await asyncio.sleep(1)
+                for tx_id, status in zip(batch, result["value"]):
+                    if status is None or not (status.get("confirmationStatus") or status.get("err")):
+                        continue
+                    
+                    future = self._pending_sigs.pop(tx_id, None)
+                    if future and not future.done():
+                        future.set_result(status.get("err"))
+
+    async def _wait_for_confirmation(self, tx_id: str, timeout: float = CONFIRMATION_TIMEOUT_SEC):
+        """Ожидание подтверждения транзакции (signatureSubscribe или общий опрос)."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        
+        try:
+            err = await self._wait_for_signature_notification(tx_id, timeout)
+        except (ConnectionError, ConnectionClosed):
+            # WebSocket недоступен - ждем через общий опрос статусов
+            err = await self._wait_for_signature_status(tx_id, deadline - loop.time())
+        
+        if err:
+            raise ValueError(f"Транзакция отклонена: {err}")
+        
+        self.logger.debug(f"✅ Транзакция подтверждена: {tx_id}")
+
+    async def _get_signature_status(self, tx_id: str) -> Optional[Dict[str, Any]]:
+        """Однократный запрос статуса транзакции (включая историю)."""
+        result = await self._rpc_call(
+            "getSignatureStatuses", [[tx_id], {"searchTransactionHistory": True}]
+        )
+        return result["value"][0]
+
+    async def _wait_for_signature_notification(self, tx_id: str, timeout: float):
+        """Ожидание уведомления signatureSubscribe."""
+        ws = self._ws
+        if ws is None or not ws.open:
+            raise ConnectionError("WebSocket подписок не подключен")
         
-        raise ValueError("Таймаут ожидания подтверждения транзакции")
+        future = asyncio.get_running_loop().create_future()
+        self._signature_futures[tx_id] = future
+        try:
+            await ws.signature_subscribe(Signature.from_string(tx_id), self.config.solana_commitment)
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            raise ConfirmationTimeoutError("Таймаут ожидания подтверждения транзакции")
+        finally:
+            self._signature_futures.pop(tx_id, None)
+
+    async def _wait_for_signature_status(self, tx_id: str, timeout: float):
+        """Ожидание статуса транзакции через общий опрос getSignatureStatuses."""
+        if self._poller_task is None:
+            self._poller_task = asyncio.create_task(self._confirmation_poller())
+        
+        future = asyncio.get_running_loop().create_future()
+        self._pending_sigs[tx_id] = future
+        self._pending_event.set()
+        try:
+            return await asyncio.wait_for(future, max(timeout, 0))
+        except asyncio.TimeoutError:
+            raise ConfirmationTimeoutError("Таймаут ожидания подтверждения транзакции")
+        finally:
+            self._pending_sigs.pop(tx_id, None)
 
     async def _update_trade_stats(self, result: TradeResult):
         """Обновление статистики торговли."""
-        self.trade_stats["total_trades"] += 1
+        self._n_total += 1
         
         if result.success:
-            self.trade_stats["successful_trades"] += 1
+            self._n_ok += 1
             if result.amount_sol:
-                self.trade_stats["total_volume_sol"] += result.amount_sol
+                self._sum_vol += result.amount_sol
         else:
-            self.trade_stats["failed_trades"] += 1
+            self._n_fail += 1
         
-        # Обновление среднего времени выполнения
-        if result.execution_time_ms:
-            current_avg = self.trade_stats["average_execution_time"]
-            total_trades = self.trade_stats["total_trades"]
-            new_avg = ((current_avg * (total_trades - 1)) + result.execution_time_ms) / total_trades
-            self.trade_stats["average_execution_time"] = new_avg
+        self._sum_time_ms += result.execution_time_ms or 0
+
+    @property
+    def trade_stats(self) -> Dict[str, Any]:
+        """Снимок счетчиков торговли."""
+        return {
+            "total_trades": self._n_total,
+            "successful_trades": self._n_ok,
+            "failed_trades": self._n_fail,
+            "total_volume_sol": self._sum_vol,
+            # Среднее по накопленной сумме (без дрейфа округления)
+            "average_execution_time": self._sum_time_ms / self._n_total if self._n_total else 0.0
+        }
 
     def get_stats(self) -> Dict[str, Any]:
         """Получение статистики торговли."""
@@ -363,9 +842,7 @@ class TradingEngine:
             **self.trade_stats,
             "daily_volume_used": self.daily_volume_used,
             "daily_volume_limit": self.daily_volume_limit,
-            "success_rate": (
-                self.trade_stats["successful_trades"] / max(self.trade_stats["total_trades"], 1) * 100
-            )
+            "success_rate": self._n_ok / max(self._n_total, 1) * 100
         }
 
     async def shutdown(self):
@@ -374,4 +851,15 @@ class TradingEngine:
         
         # Здесь можно добавить логику для корректного завершения открытых позиций
         
+        for task in list(self._send_tasks):
+            task.cancel()
+        
+        for task in (self._blockhash_task, self._ws_task, self._poller_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        
         self.logger.info("✅ Торговый движок остановлен")
@@ -4,34 +4,80 @@
 """
 
 import asyncio
-import json
 import logging
 import signal
 import sys
 import time
-import traceback
 from datetime import datetime, timezone
-from typing import Dict, List, Optional, Any
+from functools import lru_cache
+from typing import Awaitable, Callable, Dict, List, Optional, Any, Set, Tuple, Union
 import os
+import queue
+import random
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
 import websockets
-from websockets import State
+from websockets.protocol import State
 import httpx
+import orjson
 from solders.keypair import Keypair
 from solana.rpc.async_api import AsyncClient
-from solana.rpc.types import TxOpts
-from solders.transaction import Transaction
 import base58
 
 from .config import get_config, WorkerConfig
-from .encryption_utils import EncryptionUtils
-from .pump_trading import TradingEngine, TradeResult
-from .worker_metrics import start_worker_metrics_server, WorkerMetricsCollector
+from .encryption_utils import (
+    decrypt_aes_gcm,
+    decrypt_framed,
+    decrypt_packed,
+    decrypt_wallet_key,
+    encrypt_aes_gcm,
+    encrypt_framed,
+    encrypt_packed,
+    perform_key_exchange_x25519,
+)
+from .pump_trading import TradingEngine
+from .worker_metrics import start_worker_metrics_server
+
+# uvloop (на Windows - совместимый winloop) - необязательная зависимость (extra "speed"), ускоряет цикл событий
+try:
+    import uvloop
+except ImportError:
+    try:
+        import winloop as uvloop
+    except ImportError:
+        uvloop = None
+
+# Время жизни результата проверки Solana RPC в health статусе (сек)
+HEALTH_CHECK_TTL_SEC = 5.0
+
+_UTC = timezone.utc
+
+# Байт типа бинарного WebSocket фрейма
+_FRAME_PLAIN = b"\x00"
+_FRAME_ENCRYPTED = b"\x01"
+
+# Множители суффиксов размера ("50MB")
+_SIZE_SUFFIXES = {"KB": 1 << 10, "MB": 1 << 20, "GB": 1 << 30}
+
+
+@lru_cache(maxsize=2)
+def _iso_second(second: int) -> str:
+    """ISO представление целой секунды (форматируется один раз в секунду)."""
+    return datetime.fromtimestamp(second, _UTC).strftime("%Y-%m-%dT%H:%M:%S")
+
+
+def _iso_now() -> str:
+    """Текущее время UTC в ISO 8601 с миллисекундами."""
+    now = time.time()
+    second = int(now)
+    return f"{_iso_second(second)}.{int((now - second) * 1000):03d}+00:00"
 
 
 class WorkerApp:
     """Главный класс приложения воркера."""
 
+    _OPEN = State.OPEN
+
     def __init__(self, config: Optional[WorkerConfig] = None):
         # Загрузка конфигурации
         self.config = config or get_config()
@@ -42,11 +88,13 @@ class WorkerApp:
         self.websocket = None
         self.is_running = False
         self.reconnect_attempts = 0
-        self.max_reconnect_attempts = 10
 
         # Настройка логирования
         self._setup_logging()
         self.logger = logging.getLogger(__name__)
+        
+        # Отладка WebSocket: строки логов собираются только при включенном DEBUG
+        self._debug_ws = self.config.debug_websocket and self.logger.isEnabledFor(logging.DEBUG)
 
         # Инициализация метрик
         self.metrics = None
@@ -71,21 +119,73 @@ class WorkerApp:
         # HTTP клиент
         self.http_client = None
         
-        # Solana клиент
+        # Solana клиенты: по одному на каждый RPC URL, выбор по кругу среди здоровых
         self.solana_client = None
-
-        # Статистика
-        self.stats = {
-            "start_time": datetime.now(timezone.utc),
-            "messages_sent": 0,
-            "messages_received": 0,
-            "trades_executed": 0,
-            "errors": 0,
-            "last_heartbeat": None
+        self._solana_clients: List[AsyncClient] = []
+        self._solana_urls: List[str] = []
+        self._solana_idx = 0
+        self._unhealthy_rpcs: Set[int] = set()
+        self._solana_probe_task: Optional[asyncio.Task] = None
+
+        # Статистика (словарь собирается по запросу в свойстве stats)
+        self._start_time = datetime.now(timezone.utc)
+        self._messages_sent = 0
+        self._messages_received = 0
+        self._trades_executed = 0
+        self._errors = 0
+        self._last_heartbeat: Optional[datetime] = None
+
+        # Готовое сообщение регистрации для каждого (пере)подключения
+        self._registration_bytes = self._build_registration()
+        
+        # Неизменные части ответов heartbeat/status (собираются один раз)
+        self._heartbeat_template = {
+            "type": "heartbeat_ack",
+            "worker_id": self.worker_id,
+            "status": "active"
+        }
+        self._status_template = {
+            "type": "worker_status",
+            "worker_id": self.worker_id,
+            "config": {
+                "region": self.config.worker_region,
+                "capabilities": self.config.get_capabilities(),
+                "max_wallets": self.config.max_wallets_per_worker,
+                "max_concurrent_trades": self.config.max_concurrent_trades
+            }
+        }
+        
+        # Последняя проверка Solana RPC: (время проверки, результат)
+        self._solana_health = (0.0, "unknown")
+        
+        # Команды пампа выполняются в фоне, не больше max_concurrent_trades одновременно
+        self._trade_sem = asyncio.Semaphore(self.config.max_concurrent_trades)
+        self._background: Set[asyncio.Task] = set()
+        
+        # Обработчики входящих сообщений по типу
+        self._handlers: Dict[str, Callable[[Dict[str, Any]], Awaitable[None]]] = {
+            "registration_success": self._handle_registration_success,
+            "registration_error": self._handle_registration_error,
+            "pump_command": self._dispatch_pump_command,
+            "heartbeat_request": self._handle_heartbeat_request,
+            "wallet_assignment": self._handle_wallet_assignment,
+            "status_request": self._handle_status_request,
         }
 
-        # Обработчики сигналов для корректного завершения
-        self._setup_signal_handlers()
+        # Задача завершения, запущенная по сигналу
+        self._shutdown_task: Optional[asyncio.Task] = None
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Снимок статистики воркера."""
+        return {
+            "start_time": self._start_time,
+            "messages_sent": self._messages_sent,
+            "messages_received": self._messages_received,
+            "trades_executed": self._trades_executed,
+            "errors": self._errors,
+            "last_heartbeat": self._last_heartbeat
+        }
 
     def _setup_logging(self):
         """Настройка системы логирования."""
@@ -107,7 +207,6 @@ class WorkerApp:
         
         # Файловый обработчик
         if self.config.log_file:
-            from logging.handlers import RotatingFileHandler
             file_handler = RotatingFileHandler(
                 self.config.log_file,
                 maxBytes=self._parse_size(self.config.log_max_size),
@@ -121,33 +220,39 @@ class WorkerApp:
         console_handler.setFormatter(formatter)
         handlers.append(console_handler)
 
+        # Запись логов в отдельном потоке: цикл событий только кладет записи в очередь
+        log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+        self._log_listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        self._log_listener.start()
+
         # Применение настроек
         logging.basicConfig(
             level=log_level,
-            handlers=handlers,
+            handlers=[QueueHandler(log_queue)],
             force=True
         )
 
     def _parse_size(self, size_str: str) -> int:
         """Парсинг размера файла (например, '50MB')."""
         size_str = size_str.upper()
-        if size_str.endswith('MB'):
-            return int(size_str[:-2]) * 1024 * 1024
-        elif size_str.endswith('KB'):
-            return int(size_str[:-2]) * 1024
-        elif size_str.endswith('GB'):
-            return int(size_str[:-2]) * 1024 * 1024 * 1024
-        else:
-            return int(size_str)
+        multiplier = _SIZE_SUFFIXES.get(size_str[-2:])
+        return int(size_str[:-2]) * multiplier if multiplier else int(size_str)
 
     def _setup_signal_handlers(self):
-        """Настройка обработчиков сигналов."""
-        def signal_handler(signum, frame):
+        """Настройка обработчиков сигналов (вызывается из работающего цикла событий)."""
+        loop = asyncio.get_running_loop()
+
+        def on_signal(signum: int):
             self.logger.info(f"Получен сигнал {signum}, завершение работы...")
-            asyncio.create_task(self.shutdown())
+            if self._shutdown_task is None:
+                self._shutdown_task = loop.create_task(self.shutdown())
 
-        signal.signal(signal.SIGINT, signal_handler)
-        signal.signal(signal.SIGTERM, signal_handler)
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, on_signal, sig)
+            except (NotImplementedError, RuntimeError):
+                # Windows: add_signal_handler не поддерживается, передаем сигнал в цикл потокобезопасно
+                signal.signal(sig, lambda signum, frame: loop.call_soon_threadsafe(on_signal, signum))
 
     async def initialize(self):
         """Инициализация воркера."""
@@ -190,7 +295,7 @@ class WorkerApp:
 
         try:
             # Вычисление общего ключа
-            self.shared_key = EncryptionUtils.perform_key_exchange_x25519(
+            self.shared_key = perform_key_exchange_x25519(
                 self.worker_private_key, self.coordinator_public_key
             )
             self.logger.info("🔐 Шифрование инициализировано")
@@ -198,42 +303,114 @@ class WorkerApp:
         except Exception as e:
             raise ValueError(f"Ошибка инициализации шифрования: {e}")
 
-    async def _initialize_http_client(self):
-        """Инициализация HTTP клиента."""
-        timeout = httpx.Timeout(30.0)
+    def _build_http_transport(self) -> httpx.AsyncHTTPTransport:
+        """HTTP транспорт с настройками пула соединений из конфигурации."""
+        # Соединение закрывается клиентом раньше, чем его оборвет сервер по простою
         limits = httpx.Limits(
             max_keepalive_connections=self.config.http_pool_size,
-            max_connections=self.config.http_pool_size * 2
+            max_connections=self.config.http_pool_size * 4,
+            keepalive_expiry=self.config.http_keepalive_expiry
         )
         
-        self.http_client = httpx.AsyncClient(
-            timeout=timeout,
+        # Пул соединений задается на транспорте - параметры клиента при явном транспорте не действуют.
+        # HTTP/2: параллельные запросы мультиплексируются в одном соединении
+        return httpx.AsyncHTTPTransport(
+            http2=True,
             limits=limits,
+            retries=2,
             proxy=self.config.proxy_url
         )
+
+    async def _initialize_http_client(self):
+        """Инициализация HTTP клиента."""
+        self.http_client = httpx.AsyncClient(
+            transport=self._build_http_transport(),
+            timeout=httpx.Timeout(**self.config.http_timeouts)
+        )
         
         self.logger.info("🌐 HTTP клиент инициализирован")
 
     async def _initialize_solana_client(self):
-        """Инициализация Solana клиента."""
+        """Инициализация Solana клиентов для всех RPC URLs."""
         try:
-            rpc_urls = self.config.get_solana_rpc_urls()
-            self.solana_client = AsyncClient(
-                rpc_urls[0],
-                commitment=self.config.solana_commitment,
-                timeout=30
+            self._solana_urls = self.config.get_solana_rpc_urls()
+            for rpc_url in self._solana_urls:
+                client = AsyncClient(
+                    rpc_url,
+                    commitment=self.config.solana_commitment,
+                    timeout=30
+                )
+                
+                # HTTP сессия провайдера с тем же пулом и keep-alive, что и у общего клиента
+                provider = client._provider
+                await provider.session.aclose()
+                provider.session = httpx.AsyncClient(
+                    transport=self._build_http_transport(),
+                    timeout=30
+                )
+                self._solana_clients.append(client)
+            
+            # Проверка подключения через получение последнего блока (все RPC параллельно)
+            results = await asyncio.gather(
+                *(client.get_latest_blockhash() for client in self._solana_clients),
+                return_exceptions=True
             )
+            for idx, response in enumerate(results):
+                if isinstance(response, BaseException) or not response.value:
+                    self._mark_unhealthy(idx)
             
-            # Проверка подключения через получение последнего блока
-            response = await self.solana_client.get_latest_blockhash()
-            if response.value:
-                self.logger.info(f"🔗 Solana клиент подключен: {rpc_urls[0]}")
-            else:
-                raise ValueError("Не удалось получить последний блок")
+            if len(self._unhealthy_rpcs) == len(self._solana_clients):
+                raise ValueError("Не удалось получить последний блок ни с одного RPC")
+            
+            idx, self.solana_client = self._get_solana_client()
+            self.logger.info(
+                f"🔗 Solana клиент подключен: {self._solana_urls[idx]} "
+                f"(доступно RPC: {len(self._solana_clients) - len(self._unhealthy_rpcs)}/{len(self._solana_clients)})"
+            )
+            
+            self._solana_probe_task = asyncio.create_task(self._probe_unhealthy_rpcs())
             
         except Exception as e:
             raise ValueError(f"Ошибка подключения к Solana: {e}")
 
+    def _next_solana_index(self) -> int:
+        """Индекс следующего здорового RPC по кругу (если здоровых нет - любого)."""
+        count = len(self._solana_urls)
+        for _ in range(count):
+            idx = self._solana_idx
+            self._solana_idx = (idx + 1) % count
+            if idx not in self._unhealthy_rpcs:
+                return idx
+        
+        idx = self._solana_idx
+        self._solana_idx = (idx + 1) % count
+        return idx
+
+    def _get_solana_client(self) -> Tuple[int, AsyncClient]:
+        """Следующий здоровый Solana клиент по кругу."""
+        idx = self._next_solana_index()
+        return idx, self._solana_clients[idx]
+
+    def _mark_unhealthy(self, idx: int):
+        """Исключение RPC из ротации до успешной повторной проверки."""
+        if idx not in self._unhealthy_rpcs:
+            self._unhealthy_rpcs.add(idx)
+            self.logger.warning(f"⚠️ Solana RPC недоступен: {self._solana_urls[idx]}")
+
+    async def _probe_unhealthy_rpcs(self):
+        """Периодическая проверка недоступных RPC и возврат их в ротацию."""
+        while True:
+            await asyncio.sleep(self.config.health_check_interval)
+            for idx in list(self._unhealthy_rpcs):
+                try:
+                    healthy = await self._solana_clients[idx].is_connected()
+                except Exception:
+                    healthy = False
+                
+                if healthy:
+                    self._unhealthy_rpcs.discard(idx)
+                    self.logger.info(f"🔗 Solana RPC снова доступен: {self._solana_urls[idx]}")
+
     async def _initialize_trading_engine(self):
         """Инициализация торгового движка."""
         try:
@@ -241,7 +418,10 @@ class WorkerApp:
                 config=self.config,
                 solana_client=self.solana_client,
                 http_client=self.http_client,
-                logger=self.logger
+                logger=self.logger,
+                # Горячие RPC вызовы движка идут по тем же RPC с общей отметкой сбоев
+                rpc_selector=self._next_solana_index,
+                on_rpc_failure=self._mark_unhealthy
             )
             
             await self.trading_engine.initialize()
@@ -254,16 +434,24 @@ class WorkerApp:
         """Подключение к координатору."""
         self.logger.info(f"🔗 Подключение к координатору: {self.coordinator_ws_url}")
         
+        # Попытки ограничены по времени, задержка - decorrelated jitter, чтобы воркеры не переподключались синхронно
         retry_delay = self.config.retry_delay
+        deadline = time.monotonic() + self.config.reconnect_timeout_sec
         
-        while self.is_running and self.reconnect_attempts < self.max_reconnect_attempts:
+        while self.is_running and time.monotonic() < deadline:
             try:
                 # Подключение WebSocket
                 self.websocket = await websockets.connect(
                     self.coordinator_ws_url,
                     ping_interval=self.config.ws_ping_interval,
                     ping_timeout=self.config.ws_ping_timeout,
-                    close_timeout=10
+                    close_timeout=10,
+                    # Зашифрованные сообщения не сжимаются - deflate только тратит CPU
+                    compression=None if self.config.encryption_enabled else "deflate",
+                    max_size=2 ** 20,
+                    max_queue=64,
+                    read_limit=2 ** 16,
+                    write_limit=2 ** 16
                 )
                 
                 self.logger.info("✅ Подключен к координатору")
@@ -284,19 +472,23 @@ class WorkerApp:
                     f"❌ Ошибка подключения (попытка {self.reconnect_attempts}): {e}"
                 )
                 
-                if self.reconnect_attempts < self.max_reconnect_attempts:
-                    self.logger.info(f"⏳ Повтор через {retry_delay} сек...")
+                retry_delay = min(
+                    self.config.retry_delay_cap,
+                    random.uniform(self.config.retry_delay, retry_delay * self.config.backoff_factor)
+                )
+                retry_delay = min(retry_delay, max(0.0, deadline - time.monotonic()))
+                if retry_delay > 0:
+                    self.logger.info(f"⏳ Повтор через {retry_delay:.1f} сек...")
                     await asyncio.sleep(retry_delay)
-                    retry_delay *= self.config.backoff_factor
                 
                 if self.metrics:
                     self.metrics.increment_errors()
         
         return False
 
-    async def _send_registration(self):
-        """Отправка сообщения регистрации."""
-        registration_message = {
+    def _build_registration(self) -> bytes:
+        """Сообщение регистрации (неизменно на время жизни воркера, сериализуется один раз)."""
+        return orjson.dumps({
             "type": "register",
             "api_key": self.config.api_key,
             "worker_id": self.worker_id,
@@ -311,33 +503,52 @@ class WorkerApp:
                 "max_wallets": self.config.max_wallets_per_worker,
                 "max_concurrent_trades": self.config.max_concurrent_trades,
             }
-        }
-        
-        await self._send_message(registration_message)
+        })
+
+    async def _send_registration(self):
+        """Отправка сообщения регистрации."""
+        # При шифровании nonce новый на каждую отправку, открытый текст - готовый
+        await self._send_encoded(self._registration_bytes, "register")
         self.logger.info("📤 Отправлено сообщение регистрации")
 
     async def _send_message(self, message: Dict[str, Any]):
         """Отправка сообщения координатору."""
-        if not self.websocket or self.websocket.closed:
+        await self._send_encoded(orjson.dumps(message), message.get("type", "unknown"))
+
+    async def _send_encoded(self, message_bytes: bytes, message_type: str):
+        """Отправка уже сериализованного сообщения координатору."""
+        if self.websocket is None or self.websocket.state is not self._OPEN:
             raise RuntimeError("WebSocket соединение закрыто")
         
         try:
-            message_json = json.dumps(message)
+            # Бинарный фрейм: байт типа + JSON или nonce+ciphertext+tag, без второго JSON конверта
+            if self.config.ws_binary_frames:
+                if self.config.encryption_enabled and self.shared_key:
+                    frame = _FRAME_ENCRYPTED + encrypt_packed(message_bytes, self.shared_key)
+                else:
+                    frame = _FRAME_PLAIN + message_bytes
+                await self.websocket.send(frame)
+                self._messages_sent += 1
+                
+                if self._debug_ws:
+                    self.logger.debug(f"📤 Отправлено: {message_type}")
+                return
             
             # Шифрование сообщения если включено
             if self.config.encryption_enabled and self.shared_key:
-                encrypted_data = self._encrypt_message(message_json)
+                encrypted_data = self._encrypt_message(message_bytes)
                 final_message = {
                     "type": "encrypted",
                     "data": encrypted_data
                 }
-                message_json = json.dumps(final_message)
+                message_bytes = orjson.dumps(final_message)
             
-            await self.websocket.send(message_json)
-            self.stats["messages_sent"] += 1
+            # Текстовый фрейм, как и раньше ожидает координатор
+            await self.websocket.send(message_bytes.decode())
+            self._messages_sent += 1
             
-            if self.config.debug_websocket:
-                self.logger.debug(f"📤 Отправлено: {message.get('type', 'unknown')}")
+            if self._debug_ws:
+                self.logger.debug(f"📤 Отправлено: {message_type}")
             
         except Exception as e:
             self.logger.error(f"❌ Ошибка отправки сообщения: {e}")
@@ -345,10 +556,14 @@ class WorkerApp:
                 self.metrics.increment_errors()
             raise
 
-    def _encrypt_message(self, message: str) -> str:
+    def _encrypt_message(self, message: bytes) -> str:
         """Шифрование сообщения."""
         try:
-            ciphertext, nonce, tag = EncryptionUtils.encrypt_aes_gcm(
+            # Компактный формат: одна Base64 строка без разбиения на части
+            if self.config.encryption_compact_framing:
+                return encrypt_framed(message, self.shared_key)
+            
+            ciphertext, nonce, tag = encrypt_aes_gcm(
                 message, self.shared_key
             )
             return f"{ciphertext}:{nonce}:{tag}"
@@ -356,15 +571,18 @@ class WorkerApp:
             self.logger.error(f"❌ Ошибка шифрования: {e}")
             raise
 
-    def _decrypt_message(self, encrypted_data: str) -> str:
-        """Дешифрование сообщения."""
+    def _decrypt_message(self, encrypted_data: str) -> Union[str, bytes]:
+        """Дешифрование сообщения (компактный или старый формат ciphertext:nonce:tag)."""
         try:
+            if ":" not in encrypted_data:
+                return decrypt_framed(encrypted_data, self.shared_key)
+            
             parts = encrypted_data.split(":")
             if len(parts) != 3:
                 raise ValueError("Неверный формат зашифрованных данных")
             
             ciphertext, nonce, tag = parts
-            return EncryptionUtils.decrypt_aes_gcm(
+            return decrypt_aes_gcm(
                 ciphertext, nonce, tag, self.shared_key
             )
         except Exception as e:
@@ -386,35 +604,33 @@ class WorkerApp:
             if self.metrics:
                 self.metrics.increment_errors()
 
-    async def _process_message(self, raw_message: str):
-        """Обработка входящего сообщения."""
+    async def _process_message(self, raw_message: Union[str, bytes]):
+        """Обработка входящего сообщения (текстовый JSON или бинарный фрейм с байтом типа)."""
         try:
-            message = json.loads(raw_message)
-            self.stats["messages_received"] += 1
+            tag = raw_message[:1] if isinstance(raw_message, bytes) else None
+            if tag == _FRAME_ENCRYPTED:
+                message = orjson.loads(decrypt_packed(memoryview(raw_message)[1:], self.shared_key))
+            elif tag == _FRAME_PLAIN:
+                message = orjson.loads(memoryview(raw_message)[1:])
+            else:
+                message = orjson.loads(raw_message)
+            self._messages_received += 1
             
-            if self.config.debug_websocket:
-                self.logger.debug(f"📥 Получено: {message.get('type', 'unknown')}")
+            message_type = message.get("type")
+            if self._debug_ws:
+                self.logger.debug(f"📥 Получено: {message_type or 'unknown'}")
             
             # Дешифрование если нужно
-            if message.get("type") == "encrypted":
+            if message_type == "encrypted":
                 decrypted = self._decrypt_message(message["data"])
-                message = json.loads(decrypted)
+                message = orjson.loads(decrypted)
+                message_type = message.get("type")
             
             # Обработка различных типов сообщений
-            message_type = message.get("type")
+            handler = self._handlers.get(message_type)
             
-            if message_type == "registration_success":
-                await self._handle_registration_success(message)
-            elif message_type == "registration_error":
-                await self._handle_registration_error(message)
-            elif message_type == "pump_command":
-                await self._handle_pump_command(message)
-            elif message_type == "heartbeat_request":
-                await self._handle_heartbeat_request(message)
-            elif message_type == "wallet_assignment":
-                await self._handle_wallet_assignment(message)
-            elif message_type == "status_request":
-                await self._handle_status_request(message)
+            if handler:
+                await handler(message)
             else:
                 self.logger.warning(f"⚠️ Неизвестный тип сообщения: {message_type}")
             
@@ -445,6 +661,17 @@ class WorkerApp:
         # Критическая ошибка - останавливаем воркера
         await self.shutdown()
 
+    async def _dispatch_pump_command(self, message: Dict[str, Any]):
+        """Запуск команды пампа в фоне, чтобы не задерживать чтение WebSocket."""
+        task = asyncio.create_task(self._run_pump_command(message))
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def _run_pump_command(self, message: Dict[str, Any]):
+        """Выполнение команды пампа с ограничением числа одновременных сделок."""
+        async with self._trade_sem:
+            await self._handle_pump_command(message)
+
     async def _handle_pump_command(self, message: Dict[str, Any]):
         """Обработка команды пампа."""
         try:
@@ -462,13 +689,13 @@ class WorkerApp:
                 "worker_id": self.worker_id,
                 "command_id": message.get("command_id"),
                 "result": result.to_dict(),
-                "timestamp": datetime.now(timezone.utc).isoformat()
+                "timestamp": _iso_now()
             }
             
             await self._send_message(response)
             
             # Обновление статистики
-            self.stats["trades_executed"] += 1
+            self._trades_executed += 1
             if self.metrics:
                 self.metrics.increment_trades()
             
@@ -481,7 +708,7 @@ class WorkerApp:
                 "worker_id": self.worker_id,
                 "command_id": message.get("command_id"),
                 "error": str(e),
-                "timestamp": datetime.now(timezone.utc).isoformat()
+                "timestamp": _iso_now()
             }
             
             await self._send_message(error_response)
@@ -492,16 +719,14 @@ class WorkerApp:
     async def _handle_heartbeat_request(self, message: Dict[str, Any]):
         """Обработка запроса heartbeat."""
         response = {
-            "type": "heartbeat_ack",
-            "worker_id": self.worker_id,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "status": "active",
-            "stats": self.stats.copy(),
+            **self._heartbeat_template,
+            "timestamp": _iso_now(),
+            "stats": self.stats,
             "health": await self._get_health_status()
         }
         
         await self._send_message(response)
-        self.stats["last_heartbeat"] = datetime.now(timezone.utc)
+        self._last_heartbeat = datetime.now(timezone.utc)
 
     async def _handle_wallet_assignment(self, message: Dict[str, Any]):
         """Обработка назначения кошелька."""
@@ -512,27 +737,22 @@ class WorkerApp:
             if not self.shared_key:
                 raise ValueError("Шифрование не инициализировано")
             
-            # Дешифрование приватного ключа
-            private_key_base58 = EncryptionUtils.decrypt_wallet_key(
-                encrypted_key, self.shared_key
-            )
-            
-            # Создание Keypair
-            private_key_bytes = base58.b58decode(private_key_base58)
-            keypair = Keypair.from_bytes(private_key_bytes)
+            # Дешифрование ключа и создание Keypair в пуле потоков (не блокируем цикл событий)
+            keypair = await asyncio.to_thread(self._decrypt_and_build_keypair, encrypted_key)
+            public_key = str(keypair.pubkey())
             
             # Сохранение кошелька
             self.wallets[wallet_index] = keypair
             
-            self.logger.info(f"💳 Назначен кошелек {wallet_index}: {keypair.pubkey()}")
+            self.logger.info(f"💳 Назначен кошелек {wallet_index}: {public_key}")
             
             # Подтверждение
             response = {
                 "type": "wallet_assigned",
                 "worker_id": self.worker_id,
                 "wallet_index": wallet_index,
-                "public_key": str(keypair.pubkey()),
-                "timestamp": datetime.now(timezone.utc).isoformat()
+                "public_key": public_key,
+                "timestamp": _iso_now()
             }
             
             await self._send_message(response)
@@ -540,23 +760,22 @@ class WorkerApp:
         except Exception as e:
             self.logger.error(f"❌ Ошибка назначения кошелька: {e}")
 
+    def _decrypt_and_build_keypair(self, encrypted_key: str) -> Keypair:
+        """Дешифрование приватного ключа кошелька и создание Keypair."""
+        private_key_base58 = decrypt_wallet_key(encrypted_key, self.shared_key)
+        private_key_bytes = base58.b58decode(private_key_base58)
+        return Keypair.from_bytes(private_key_bytes)
+
     async def _handle_status_request(self, message: Dict[str, Any]):
         """Обработка запроса статуса."""
         status = {
-            "type": "worker_status",
-            "worker_id": self.worker_id,
+            **self._status_template,
             "status": "active" if self.is_running else "inactive",
-            "uptime": (datetime.now(timezone.utc) - self.stats["start_time"]).total_seconds(),
-            "stats": self.stats.copy(),
-            "config": {
-                "region": self.config.worker_region,
-                "capabilities": self.config.get_capabilities(),
-                "max_wallets": self.config.max_wallets_per_worker,
-                "max_concurrent_trades": self.config.max_concurrent_trades
-            },
+            "uptime": (datetime.now(timezone.utc) - self._start_time).total_seconds(),
+            "stats": self.stats,
             "health": await self._get_health_status(),
             "wallets": len(self.wallets),
-            "timestamp": datetime.now(timezone.utc).isoformat()
+            "timestamp": _iso_now()
         }
         
         await self._send_message(status)
@@ -565,24 +784,13 @@ class WorkerApp:
         """Получение статуса здоровья воркера."""
         health = {
             "overall": "healthy",
-            "websocket": "connected" if self.websocket and not self.websocket.closed else "disconnected",
-            "solana_client": "unknown",
+            "websocket": "connected" if self.websocket is not None and self.websocket.state is self._OPEN else "disconnected",
+            "solana_client": await self._get_solana_health(),
             "trading_engine": "unknown",
             "memory_usage": 0,
-            "errors_24h": self.stats.get("errors", 0)
+            "errors_24h": self._errors
         }
         
-        try:
-            # Проверка Solana клиента
-            if self.solana_client:
-                response = await self.solana_client.get_latest_blockhash()
-                if response.value:
-                    health["solana_client"] = "healthy"
-                else:
-                    health["solana_client"] = "unhealthy"
-        except:
-            health["solana_client"] = "unhealthy"
-        
         # Проверка торгового движка
         if self.trading_engine:
             health["trading_engine"] = "ready"
@@ -604,10 +812,34 @@ class WorkerApp:
         
         return health
 
+    async def _get_solana_health(self) -> str:
+        """Состояние Solana RPC (результат проверки кэшируется на HEALTH_CHECK_TTL_SEC)."""
+        checked_at, result = self._solana_health
+        if not self.solana_client or time.monotonic() - checked_at < HEALTH_CHECK_TTL_SEC:
+            return result
+        
+        # Проверяются все RPC сразу: статус не зависит от очереди ротации и обновляет отметки сбоев
+        responses = await asyncio.gather(
+            *(client.get_latest_blockhash() for client in self._solana_clients),
+            return_exceptions=True
+        )
+        for idx, response in enumerate(responses):
+            if isinstance(response, BaseException) or not response.value:
+                self._mark_unhealthy(idx)
+            elif idx in self._unhealthy_rpcs:
+                self._unhealthy_rpcs.discard(idx)
+                self.logger.info(f"🔗 Solana RPC снова доступен: {self._solana_urls[idx]}")
+        
+        # Торговля возможна, пока в ротации есть хотя бы один RPC
+        result = "healthy" if len(self._unhealthy_rpcs) < len(self._solana_clients) else "unhealthy"
+        self._solana_health = (time.monotonic(), result)
+        return result
+
     async def run(self):
         """Основной цикл работы воркера."""
         self.is_running = True
         self.logger.info("🏃 Запуск воркера...")
+        self._setup_signal_handlers()
         
         try:
             # Инициализация
@@ -652,17 +884,25 @@ class WorkerApp:
         self.is_running = False
         
         try:
+            # Отмена незавершенных команд пампа
+            for task in list(self._background):
+                task.cancel()
+            if self._background:
+                await asyncio.gather(*self._background, return_exceptions=True)
+            
             # Закрытие WebSocket
-            if self.websocket and not self.websocket.closed:
+            if self.websocket is not None and self.websocket.state is self._OPEN:
                 await self.websocket.close()
             
             # Закрытие HTTP клиента
             if self.http_client:
                 await self.http_client.aclose()
             
-            # Закрытие Solana клиента
-            if self.solana_client:
-                await self.solana_client.close()
+            # Закрытие Solana клиентов
+            if self._solana_probe_task:
+                self._solana_probe_task.cancel()
+            for client in self._solana_clients:
+                await client.close()
             
             # Остановка торгового движка
             if self.trading_engine:
@@ -676,6 +916,9 @@ class WorkerApp:
             
         except Exception as e:
             self.logger.error(f"❌ Ошибка при завершении: {e}")
+        
+        # Дописываем оставшиеся в очереди логи
+        self._log_listener.stop()
 
 
 def main():
@@ -683,7 +926,12 @@ def main():
     try:
         # Создание и запуск воркера
         worker = WorkerApp()
-        asyncio.run(worker.run())
+        
+        # Цикл событий uvloop (таймеры asyncio.sleep с точностью до 1 мс)
+        # asyncio.Runner принимает loop_factory начиная с Python 3.11 (asyncio.run - только с 3.12)
+        loop_factory = uvloop.new_event_loop if uvloop and worker.config.use_uvloop else None
+        with asyncio.Runner(loop_factory=loop_factory) as runner:
+            runner.run(worker.run())
         
     except KeyboardInterrupt:
         print("\n🛑 Получен сигнал прерывания")
@@ -4,36 +4,215 @@
 """
 
 import asyncio
+import bisect
 import logging
+from concurrent.futures import ThreadPoolExecutor
+import os
+import socket
+import socketserver
 import time
 from datetime import datetime, timezone
-from typing import Dict, Optional, Any
+from typing import Dict, Optional
 from threading import Thread
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer
+
+import orjson
 
 try:
     from prometheus_client import (
         Counter, Gauge, Histogram, Info, CollectorRegistry,
-        generate_latest, CONTENT_TYPE_LATEST, start_http_server
+        generate_latest, CONTENT_TYPE_LATEST
     )
-    from fastapi import FastAPI, Response
+    from starlette.applications import Starlette
+    from starlette.requests import Request
+    from starlette.responses import Response
+    from starlette.routing import Route
     import uvicorn
     METRICS_AVAILABLE = True
 except ImportError:
     METRICS_AVAILABLE = False
 
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+class _MutexFreeValue:
+    """Значение метрики без блокировки (для воркера, обновляющего метрики из одного потока)."""
+
+    _multiprocess = False
+
+    def __init__(self, typ, metric_name, name, labelnames, labelvalues, help_text, **kwargs):
+        self._value = 0.0
+        self._exemplar = None
+
+    def inc(self, amount):
+        self._value += amount
+
+    def set(self, value, timestamp=None):
+        self._value = value
+
+    def set_exemplar(self, exemplar):
+        self._exemplar = exemplar
+
+    def get(self):
+        return self._value
+
+    def get_exemplar(self):
+        return self._exemplar
+
+
+# Подмена должна произойти до создания первой метрики; multiprocess режим не трогаем
+if METRICS_AVAILABLE and os.getenv('WORKER_METRICS_UNSAFE_NOLOCK') == '1':
+    import prometheus_client.values as _prometheus_values
+
+    if _prometheus_values.ValueClass is _prometheus_values.MutexValue:
+        _prometheus_values.ValueClass = _MutexFreeValue
+
+# Публичные методы обновления метрик, заменяемые заглушкой при отключенных метриках
+_UPDATE_METHODS = (
+    'increment_messages_sent', 'increment_messages_received', 'increment_trades',
+    'increment_errors', 'observe_trade_duration', 'set_connection_status',
+    'increment_reconnection_attempts', 'set_active_wallets', 'set_wallet_balance',
+    'update_system_metrics', 'update_uptime', 'set_worker_status',
+)
+
+
+def _noop(*args, **kwargs):
+    return None
+
+
+# Значение метрики статуса воркера по названию статуса
+_STATUS_VALUES = {
+    'healthy': 1.0,
+    'initializing': 0.5,
+    'connected': 1.0,
+    'registered': 1.0,
+    'active': 1.0,
+    'error': 0.0,
+    'stopped': 0.0,
+    'disconnected': 0.0,
+}
+
+# Известные типы ошибок: дочерние метрики для них создаются заранее
+ERROR_TYPES = ('websocket', 'trading', 'solana', 'general', 'rpc', 'timeout')
+
+
+if METRICS_AVAILABLE:
+    class FastHistogram(Histogram):
+        """Histogram с выбором бакета бинарным поиском вместо перебора границ."""
+
+        def observe(self, amount: float, exemplar: Optional[Dict[str, str]] = None) -> None:
+            # Экземпляры и NaN обрабатывает исходная реализация
+            if exemplar or amount != amount:
+                return super().observe(amount, exemplar)
+            
+            self._raise_if_not_observable()
+            self._sum.inc(amount)
+            # Первая граница >= amount, последняя граница - +Inf
+            self._buckets[bisect.bisect_left(self._upper_bounds, amount)].inc(1)
+
+
+class _UnixWSGIServer(WSGIServer):
+    """WSGI сервер на Unix domain socket."""
+
+    address_family = socket.AF_UNIX
+
+    def server_bind(self):
+        # HTTPServer.server_bind ожидает (host, port) - привязываемся к пути сокета напрямую
+        socketserver.TCPServer.server_bind(self)
+        self.server_name = 'localhost'
+        self.server_port = 0
+        self.setup_environ()
+
+
+class _SilentRequestHandler(WSGIRequestHandler):
+    """Обработчик запросов без логирования."""
+
+    # Запросы обслуживаются по очереди в одном потоке - зависший клиент не держит сервер дольше таймаута
+    timeout = 10
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _UnixRequestHandler(_SilentRequestHandler):
+    """Обработчик запросов через Unix socket."""
+
+    def setup(self):
+        # У Unix socket нет адреса клиента, а WSGI окружению нужен REMOTE_ADDR
+        self.client_address = ('unix', 0)
+        super().setup()
+
+
+class _FlushOnCollect:
+    """Коллектор без метрик: перед каждым сбором переносит накопленные счетчики в метрики."""
+
+    def __init__(self, flush):
+        self._flush = flush
+
+    def describe(self):
+        return []
+
+    def collect(self):
+        self._flush()
+        return []
+
 
 class WorkerMetricsCollector:
     """Сборщик метрик для воркера."""
 
-    def __init__(self, worker_id: str, registry: Optional[CollectorRegistry] = None):
+    # Фиксированный набор атрибутов: без __dict__ на экземпляре, опечатка в имени - AttributeError
+    __slots__ = (
+        'worker_id', 'registry', 'enabled',
+        'worker_info', 'worker_status', 'worker_uptime',
+        'messages_sent_total', 'messages_received_total',
+        'trades_executed_total', 'trade_volume_sol_total', 'trade_execution_duration',
+        'errors_total', 'connection_status', 'reconnection_attempts_total',
+        'active_wallets', 'wallet_balance_sol_total', 'wallet_balance_sol_min', 'wallet_balance_sol_max',
+        'memory_usage_bytes', 'cpu_usage_percent',
+        '_trades_success', '_trades_failed', '_errors', '_wallet_balances',
+        '_sent', '_recv', '_volume', '_flushed_sent', '_flushed_recv', '_flushed_volume',
+        '_start_monotonic', '_proc', '_cache_bytes', '_cache_ts', '_cache_ttl', '_allowed_prefixes',
+    )
+
+    def __init__(self, worker_id: str, registry: Optional["CollectorRegistry"] = None):
         self.worker_id = worker_id
         self.registry = registry or CollectorRegistry()
         
-        if not METRICS_AVAILABLE:
-            self.enabled = False
-            return
-        
         self.enabled = True
+        self._start_monotonic = time.monotonic()
+        
+        # Последний результат generate_latest: scrape в пределах TTL получают готовые байты
+        self._cache_bytes = b""
+        self._cache_ts = 0.0
+        self._cache_ttl = float(os.getenv('METRICS_CACHE_TTL', '1.0'))
+        
+        # METRICS_ALLOWLIST: префиксы имен метрик через запятую, остальные семейства не отдаются
+        self._allowed_prefixes = tuple(
+            name.strip().encode() for name in os.getenv('METRICS_ALLOWLIST', '').split(',') if name.strip()
+        )
+        
+        # Балансы кошельков (адрес -> SOL); наружу отдаются только агрегаты
+        self._wallet_balances: Dict[str, float] = {}
+        
+        # Частые счетчики копятся в обычных числах и переносятся в Counter при сборе метрик.
+        # Нарастающие итоги пишет только цикл событий, перенесенную часть - только поток scrape
+        self._sent = 0
+        self._recv = 0
+        self._volume = 0.0
+        self._flushed_sent = 0
+        self._flushed_recv = 0
+        self._flushed_volume = 0.0
+        
+        # Дескриптор процесса создается один раз; первый cpu_percent задает точку отсчета
+        self._proc = psutil.Process() if psutil else None
+        if self._proc:
+            self._proc.cpu_percent(None)
+        
+        # Регистрируется первым, чтобы перенос выполнялся до сбора остальных метрик
+        self.registry.register(_FlushOnCollect(self.flush_pending))
         self._setup_metrics()
 
     def _setup_metrics(self):
@@ -91,10 +270,11 @@ class WorkerMetricsCollector:
             registry=self.registry
         )
 
-        self.trade_execution_duration = Histogram(
+        self.trade_execution_duration = FastHistogram(
             'pump_bot_worker_trade_execution_duration_seconds',
             'Time taken to execute trades',
-            buckets=[0.1, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0],
+            # Только пороги SLO: меньше сравнений в observe и рядов в выдаче
+            buckets=[0.5, 2.0, 10.0],
             registry=self.registry
         )
 
@@ -106,6 +286,11 @@ class WorkerMetricsCollector:
             registry=self.registry
         )
 
+        # Дочерние метрики с метками создаются один раз, без .labels() на каждый вызов
+        self._trades_success = self.trades_executed_total.labels(status='success')
+        self._trades_failed = self.trades_executed_total.labels(status='failed')
+        self._errors = {t: self.errors_total.labels(type=t) for t in ERROR_TYPES}
+
         # Подключения
         self.connection_status = Gauge(
             'pump_bot_worker_connection_status',
@@ -126,10 +311,22 @@ class WorkerMetricsCollector:
             registry=self.registry
         )
 
-        self.wallet_balance_sol = Gauge(
-            'pump_bot_worker_wallet_balance_sol',
-            'Wallet balance in SOL',
-            ['wallet_address'],
+        # Без метки wallet_address: число временных рядов не растет с числом кошельков
+        self.wallet_balance_sol_total = Gauge(
+            'pump_bot_worker_wallet_balance_sol_total',
+            'Total balance of all wallets in SOL',
+            registry=self.registry
+        )
+
+        self.wallet_balance_sol_min = Gauge(
+            'pump_bot_worker_wallet_balance_sol_min',
+            'Minimum wallet balance in SOL',
+            registry=self.registry
+        )
+
+        self.wallet_balance_sol_max = Gauge(
+            'pump_bot_worker_wallet_balance_sol_max',
+            'Maximum wallet balance in SOL',
             registry=self.registry
         )
 
@@ -148,113 +345,116 @@ class WorkerMetricsCollector:
 
     def set_worker_status(self, status: str):
         """Установка статуса воркера."""
-        if not self.enabled:
-            return
-
-        status_value = {
-            'healthy': 1,
-            'initializing': 0.5,
-            'connected': 1,
-            'registered': 1,
-            'active': 1,
-            'error': 0,
-            'stopped': 0,
-            'disconnected': 0
-        }.get(status, 0)
-
-        self.worker_status.set(status_value)
-
-    def update_uptime(self, start_time: datetime):
-        """Обновление времени работы."""
-        if not self.enabled:
-            return
+        self.worker_status.set(_STATUS_VALUES.get(status, 0.0))
 
-        uptime = (datetime.now(timezone.utc) - start_time).total_seconds()
-        self.worker_uptime.set(uptime)
+    def update_uptime(self, start_time: Optional[datetime] = None):
+        """Обновление времени работы (отсчет от создания сборщика, start_time не используется)."""
+        self.worker_uptime.set(time.monotonic() - self._start_monotonic)
 
     def increment_messages_sent(self):
         """Увеличение счетчика отправленных сообщений."""
-        if not self.enabled:
-            return
-        self.messages_sent_total.inc()
+        self._sent += 1
 
     def increment_messages_received(self):
         """Увеличение счетчика полученных сообщений."""
-        if not self.enabled:
-            return
-        self.messages_received_total.inc()
+        self._recv += 1
 
     def increment_trades(self, status: str = 'success', volume_sol: float = 0):
         """Увеличение счетчика торговых операций."""
-        if not self.enabled:
-            return
-        
-        self.trades_executed_total.labels(status=status).inc()
+        if status == 'success':
+            self._trades_success.inc()
+        elif status == 'failed':
+            self._trades_failed.inc()
+        else:
+            self.trades_executed_total.labels(status=status).inc()
         if volume_sol > 0:
-            self.trade_volume_sol_total.inc(volume_sol)
+            self._volume += volume_sol
 
     def observe_trade_duration(self, duration_seconds: float):
         """Добавление времени выполнения торговой операции."""
-        if not self.enabled:
-            return
         self.trade_execution_duration.observe(duration_seconds)
 
     def increment_errors(self, error_type: str = 'general'):
         """Увеличение счетчика ошибок."""
-        if not self.enabled:
-            return
-        self.errors_total.labels(type=error_type).inc()
+        child = self._errors.get(error_type)
+        if child is None:
+            child = self.errors_total.labels(type=error_type)
+        child.inc()
 
     def set_connection_status(self, connected: bool):
         """Установка статуса подключения."""
-        if not self.enabled:
-            return
         self.connection_status.set(1 if connected else 0)
 
     def increment_reconnection_attempts(self):
         """Увеличение счетчика попыток переподключения."""
-        if not self.enabled:
-            return
         self.reconnection_attempts_total.inc()
 
     def set_active_wallets(self, count: int):
         """Установка количества активных кошельков."""
-        if not self.enabled:
-            return
         self.active_wallets.set(count)
 
     def set_wallet_balance(self, wallet_address: str, balance_sol: float):
-        """Установка баланса кошелька."""
-        if not self.enabled:
-            return
-        self.wallet_balance_sol.labels(wallet_address=wallet_address).set(balance_sol)
+        """Установка баланса кошелька (обновляет агрегаты по всем кошелькам)."""
+        balances = self._wallet_balances
+        balances[wallet_address] = balance_sol
+        values = balances.values()
+        self.wallet_balance_sol_total.set(sum(values))
+        self.wallet_balance_sol_min.set(min(values))
+        self.wallet_balance_sol_max.set(max(values))
 
     def update_system_metrics(self):
         """Обновление системных метрик."""
-        if not self.enabled:
+        process = self._proc
+        if process is None:
             return
-
-        try:
-            import psutil
-            process = psutil.Process()
-            
-            # Память
-            memory_info = process.memory_info()
-            self.memory_usage_bytes.set(memory_info.rss)
-            
-            # CPU
-            cpu_percent = process.cpu_percent()
-            self.cpu_usage_percent.set(cpu_percent)
-            
-        except ImportError:
-            pass
-
-    def get_metrics(self) -> str:
-        """Получение метрик в формате Prometheus."""
-        if not self.enabled:
-            return "# Metrics disabled\n"
         
-        return generate_latest(self.registry).decode('utf-8')
+        # Память
+        self.memory_usage_bytes.set(process.memory_info().rss)
+        
+        # CPU
+        self.cpu_usage_percent.set(process.cpu_percent())
+
+    def flush_pending(self):
+        """Перенос накопленных счетчиков сообщений и объема в метрики Prometheus."""
+        sent, recv, volume = self._sent, self._recv, self._volume
+        if sent != self._flushed_sent:
+            self.messages_sent_total.inc(sent - self._flushed_sent)
+            self._flushed_sent = sent
+        if recv != self._flushed_recv:
+            self.messages_received_total.inc(recv - self._flushed_recv)
+            self._flushed_recv = recv
+        if volume != self._flushed_volume:
+            self.trade_volume_sol_total.inc(volume - self._flushed_volume)
+            self._flushed_volume = volume
+
+    def get_metrics(self) -> bytes:
+        """Получение метрик в формате Prometheus (кэшируется на METRICS_CACHE_TTL сек)."""
+        now = time.monotonic()
+        if now - self._cache_ts < self._cache_ttl:
+            return self._cache_bytes
+        
+        payload = generate_latest(self.registry)
+        if self._allowed_prefixes:
+            payload = self._filter_allowed(payload)
+        
+        self._cache_bytes = payload
+        self._cache_ts = now
+        return self._cache_bytes
+
+
+    def _filter_allowed(self, payload: bytes) -> bytes:
+        """Оставить в выдаче только метрики из METRICS_ALLOWLIST (вместе с их HELP/TYPE)."""
+        allowed = self._allowed_prefixes
+        kept = []
+        for line in payload.split(b'\n'):
+            if not line:
+                continue
+            # "# HELP name ..." / "# TYPE name ..." - имя третьим словом
+            name = line.split(b' ', 3)[2] if line.startswith(b'#') else line
+            if name.startswith(allowed):
+                kept.append(line)
+        kept.append(b'')
+        return b'\n'.join(kept)
 
 
 class MetricsServer:
@@ -268,60 +468,65 @@ class MetricsServer:
         self.app = None
         self.server_task = None
         self.logger = logging.getLogger(__name__)
+        
+        # Сериализация метрик вне цикла событий; один поток - параллельные scrape не дублируют работу
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='metrics-gen')
 
-    def create_app(self) -> FastAPI:
-        """Создание FastAPI приложения."""
-        app = FastAPI(
-            title=f"Pump Bot Worker Metrics - {self.worker_id}",
-            description="Prometheus metrics for Pump Bot Worker",
-            version="2.0.0"
-        )
-
-        @app.get(self.path)
-        async def metrics():
+    def create_app(self) -> "Starlette":
+        """Создание ASGI приложения (Starlette без валидации и OpenAPI FastAPI)."""
+        async def metrics(request: Request) -> Response:
             """Endpoint для метрик."""
-            metrics_data = self.collector.get_metrics()
+            metrics_data = await asyncio.get_running_loop().run_in_executor(
+                self._executor, self.collector.get_metrics
+            )
             return Response(
                 content=metrics_data,
                 media_type=CONTENT_TYPE_LATEST
             )
 
-        @app.get('/health')
-        async def health():
+        # Ответ /info не меняется - сериализуется один раз
+        info_bytes = orjson.dumps({
+            "worker_id": self.worker_id,
+            "version": "2.0.0",
+            "type": "pump_trading_worker",
+            "metrics_path": self.path,
+            "port": self.port
+        })
+
+        async def health(request: Request) -> Response:
             """Health check endpoint."""
-            return {
-                "status": "healthy",
-                "worker_id": self.worker_id,
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-                "metrics_enabled": self.collector.enabled
-            }
-
-        @app.get('/info')
-        async def info():
+            return Response(
+                content=orjson.dumps({
+                    "status": "healthy",
+                    "worker_id": self.worker_id,
+                    "timestamp": datetime.now(timezone.utc).isoformat(),
+                    "metrics_enabled": self.collector.enabled
+                }),
+                media_type="application/json"
+            )
+
+        async def info(request: Request) -> Response:
             """Информация о воркере."""
-            return {
-                "worker_id": self.worker_id,
-                "version": "2.0.0",
-                "type": "pump_trading_worker",
-                "metrics_path": self.path,
-                "port": self.port
-            }
+            return Response(content=info_bytes, media_type="application/json")
 
-        return app
+        return Starlette(routes=[
+            Route(self.path, metrics),
+            Route('/health', health),
+            Route('/info', info),
+        ])
 
     async def start_async(self):
         """Асинхронный запуск сервера."""
-        if not METRICS_AVAILABLE:
-            self.logger.warning("⚠️ Зависимости для метрик не установлены")
-            return None
-
         try:
             self.app = self.create_app()
             
+            # METRICS_UDS: слушать Unix socket вместо TCP порта (host/port игнорируются)
+            uds = os.getenv('METRICS_UDS')
             config = uvicorn.Config(
                 app=self.app,
                 host="0.0.0.0",
                 port=self.port,
+                uds=uds,
                 log_level="warning",
                 access_log=False
             )
@@ -329,7 +534,7 @@ class MetricsServer:
             server = uvicorn.Server(config)
             self.server_task = asyncio.create_task(server.serve())
             
-            self.logger.info(f"📊 Сервер метрик запущен на порту {self.port}")
+            self.logger.info(f"📊 Сервер метрик запущен на {uds or f'порту {self.port}'}")
             return self.collector
             
         except Exception as e:
@@ -338,13 +543,18 @@ class MetricsServer:
 
     def start_threaded(self):
         """Запуск сервера в отдельном потоке."""
-        if not METRICS_AVAILABLE:
-            self.logger.warning("⚠️ Зависимости для метрик не установлены")
-            return None
-
         try:
-            # Простой HTTP сервер для метрик
-            start_http_server(self.port, registry=self.collector.registry)
+            uds = os.getenv('METRICS_UDS')
+            if uds:
+                # Сокет от предыдущего запуска мешает bind
+                if os.path.exists(uds):
+                    os.unlink(uds)
+                self._serve_wsgi(_UnixWSGIServer(uds, _UnixRequestHandler))
+                self.logger.info(f"📊 Сервер метрик запущен на {uds}")
+                return self.collector
+            
+            # Простой HTTP сервер для метрик: один поток вместо потока на каждый запрос
+            self._serve_wsgi(WSGIServer(("0.0.0.0", self.port), _SilentRequestHandler))
             self.logger.info(f"📊 Сервер метрик запущен на порту {self.port}")
             return self.collector
             
@@ -352,6 +562,16 @@ class MetricsServer:
             self.logger.error(f"❌ Ошибка запуска сервера метрик: {e}")
             return None
 
+    def _metrics_wsgi_app(self, environ, start_response):
+        """WSGI приложение метрик: выдача сборщика с кэшем и фильтром METRICS_ALLOWLIST."""
+        start_response('200 OK', [('Content-Type', CONTENT_TYPE_LATEST)])
+        return [self.collector.get_metrics()]
+
+    def _serve_wsgi(self, httpd: WSGIServer):
+        """Запуск WSGI сервера метрик в одном фоновом потоке."""
+        httpd.set_app(self._metrics_wsgi_app)
+        Thread(target=httpd.serve_forever, name='metrics-http', daemon=True).start()
+
     async def stop(self):
         """Остановка сервера."""
         if self.server_task:
@@ -360,7 +580,8 @@ class MetricsServer:
                 await self.server_task
             except asyncio.CancelledError:
                 pass
-            
+        
+        self._executor.shutdown(wait=False)
         self.logger.info("📊 Сервер метрик остановлен")
 
 
@@ -387,8 +608,28 @@ def start_worker_metrics_server(worker_id: str, port: int = 8081) -> Optional[Wo
 # Фиктивные классы для совместимости если зависимости не установлены
 if not METRICS_AVAILABLE:
     class WorkerMetricsCollector:
+        enabled = False
+
         def __init__(self, *args, **kwargs):
-            self.enabled = False
-            
+            pass
+
+        def get_metrics(self) -> bytes:
+            return b"# Metrics disabled\n"
+
         def __getattr__(self, name):
-            return lambda *args, **kwargs: None
+            return _noop
+
+    # Методы обновления - пустая функция прямо в классе, без вызова __getattr__
+    for _name in _UPDATE_METHODS:
+        setattr(WorkerMetricsCollector, _name, staticmethod(_noop))
+
+    def _start_unavailable(self):
+        """Запуск сервера без зависимостей для метрик."""
+        self.logger.warning("⚠️ Зависимости для метрик не установлены")
+        return None
+
+    async def _start_unavailable_async(self):
+        return _start_unavailable(self)
+
+    MetricsServer.start_threaded = _start_unavailable
+    MetricsServer.start_async = _start_unavailable_async
@@ -0,0 +1,22 @@
+"""Общие фикстуры тестов."""
+
+import pytest
+
+from src.config import WorkerConfig
+
+
+def make_config(**overrides) -> WorkerConfig:
+    """Конфигурация без .env файла и переменных окружения проекта."""
+    values = {
+        "worker_id": "test-worker",
+        "coordinator_ws_url": "ws://localhost:8000/ws",
+        "api_key": "test-key",
+        "solana_private_key": "test",
+    }
+    values.update(overrides)
+    return WorkerConfig(_env_file=None, **values)
+
+
+@pytest.fixture
+def config() -> WorkerConfig:
+    return make_config()
@@ -0,0 +1,83 @@
+"""Тесты загрузки конфигурации из .env."""
+
+import os
+
+import pytest
+from pydantic_settings import DotEnvSettingsSource
+
+from src.config import CachedDotEnvSettingsSource, WorkerConfig
+from tests.conftest import make_config
+
+REQUIRED = (
+    "WORKER_ID=dotenv-worker\n"
+    "COORDINATOR_WS_URL=ws://localhost:8000/ws\n"
+    "API_KEY=key\n"
+    "SOLANA_PRIVATE_KEY=test\n"
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_env_cache(monkeypatch):
+    monkeypatch.setattr(CachedDotEnvSettingsSource, "_cache", {})
+
+
+@pytest.fixture
+def env_reads(monkeypatch):
+    """Счетчик фактических разборов .env файла."""
+    reads = []
+    original = DotEnvSettingsSource._read_env_file
+
+    def read_env_file(self, file_path):
+        reads.append(file_path)
+        return original(self, file_path)
+
+    monkeypatch.setattr(DotEnvSettingsSource, "_read_env_file", read_env_file)
+    return reads
+
+
+def write_env(path, region: str, mtime_ns: int):
+    path.write_text(REQUIRED + f"WORKER_REGION={region}\n")
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_env_file_parsed_once_per_mtime(tmp_path, env_reads):
+    env_file = tmp_path / ".env"
+    write_env(env_file, "eu", 1_000_000_000)
+
+    first = WorkerConfig(_env_file=env_file)
+    second = WorkerConfig(_env_file=env_file)
+
+    assert first.worker_region == second.worker_region == "eu"
+    assert len(env_reads) == 1
+
+
+def test_env_file_reparsed_after_change(tmp_path, env_reads):
+    env_file = tmp_path / ".env"
+    write_env(env_file, "eu", 1_000_000_000)
+    assert WorkerConfig(_env_file=env_file).worker_region == "eu"
+
+    write_env(env_file, "us", 2_000_000_000)
+
+    assert WorkerConfig(_env_file=env_file).worker_region == "us"
+    assert len(env_reads) == 2
+
+
+def test_default_env_file_loaded(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    write_env(tmp_path / ".env", "eu", 1_000_000_000)
+
+    config = WorkerConfig()
+
+    assert config.worker_id == "dotenv-worker"
+    assert config.worker_region == "eu"
+
+
+def test_env_file_none_opt_out(tmp_path, monkeypatch, env_reads):
+    monkeypatch.chdir(tmp_path)
+    write_env(tmp_path / ".env", "eu", 1_000_000_000)
+
+    config = make_config()
+
+    assert config.worker_id == "test-worker"
+    assert config.worker_region == "unknown"
+    assert env_reads == []
@@ -0,0 +1,106 @@
+"""Тесты шифрования ключей кошельков и данных паролем."""
+
+import base64
+import hashlib
+import os
+
+import base58
+import pytest
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from solders.keypair import Keypair
+
+from src.encryption_utils import (
+    PasswordCipher,
+    decrypt_sensitive_data,
+    decrypt_wallet_key,
+    encrypt_aes_gcm,
+    encrypt_sensitive_data,
+    encrypt_wallet_key,
+    encrypt_wallet_keys_batch,
+)
+
+
+@pytest.fixture
+def shared_key() -> bytes:
+    return os.urandom(32)
+
+
+@pytest.fixture
+def private_key() -> str:
+    return base58.b58encode(bytes(Keypair())).decode()
+
+
+def test_wallet_key_round_trip(shared_key, private_key):
+    encrypted = encrypt_wallet_key(private_key, shared_key)
+
+    assert ":" not in encrypted
+    assert decrypt_wallet_key(encrypted, shared_key) == private_key
+
+
+def test_wallet_key_uses_fresh_nonce(shared_key, private_key):
+    assert encrypt_wallet_key(private_key, shared_key) != encrypt_wallet_key(private_key, shared_key)
+
+
+def test_wallet_key_old_format(shared_key, private_key):
+    encrypted = ":".join(encrypt_aes_gcm(private_key, shared_key))
+
+    assert decrypt_wallet_key(encrypted, shared_key) == private_key
+
+
+def test_wallet_keys_batch_round_trip(shared_key):
+    keys = [base58.b58encode(bytes(Keypair())).decode() for _ in range(3)]
+
+    encrypted = encrypt_wallet_keys_batch(keys, shared_key)
+
+    assert [decrypt_wallet_key(item, shared_key) for item in encrypted] == keys
+
+
+def test_wallet_key_wrong_key(shared_key, private_key):
+    encrypted = encrypt_wallet_key(private_key, shared_key)
+
+    with pytest.raises(InvalidTag):
+        decrypt_wallet_key(encrypted, os.urandom(32))
+
+
+def test_wallet_key_malformed_old_format(shared_key):
+    with pytest.raises(ValueError, match="ciphertext:nonce:tag"):
+        decrypt_wallet_key("abc:def", shared_key)
+
+
+def test_wallet_key_truncated(shared_key):
+    with pytest.raises(ValueError):
+        decrypt_wallet_key("AAAA", shared_key)
+
+
+def test_sensitive_data_fresh_salt_per_call():
+    first = base64.b64decode(encrypt_sensitive_data("secret", "password"))
+    second = base64.b64decode(encrypt_sensitive_data("secret", "password"))
+
+    assert first[:16] != second[:16]
+
+
+def test_sensitive_data_round_trip():
+    encrypted = encrypt_sensitive_data("secret", "password")
+
+    assert decrypt_sensitive_data(encrypted, "password") == "secret"
+    with pytest.raises(InvalidTag):
+        decrypt_sensitive_data(encrypted, "other")
+
+
+def test_password_cipher_reads_other_ciphertexts():
+    cipher = PasswordCipher("password")
+    own = cipher.encrypt("own")
+    foreign = encrypt_sensitive_data("foreign", "password")
+
+    assert cipher.decrypt(own) == "own"
+    assert cipher.decrypt(foreign) == "foreign"
+    assert decrypt_sensitive_data(own, "password") == "own"
+
+
+def test_sensitive_data_legacy_pbkdf2():
+    salt, nonce = os.urandom(16), os.urandom(12)
+    key = hashlib.pbkdf2_hmac("sha256", b"password", salt, 100000)
+    encrypted = base64.b64encode(salt + nonce + AESGCM(key).encrypt(nonce, b"legacy", None)).decode()
+
+    assert decrypt_sensitive_data(encrypted, "password") == "legacy"
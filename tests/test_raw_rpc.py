@@ -0,0 +1,89 @@
+"""Тесты JSON-RPC клиента Solana поверх httpx."""
+
+import httpx
+import orjson
+import pytest
+
+from src.pump_trading import BatchRejectedError, RawSolanaRPC
+
+RPC_URL = "http://rpc.test"
+
+
+def make_rpc(handler) -> RawSolanaRPC:
+    return RawSolanaRPC(httpx.AsyncClient(transport=httpx.MockTransport(handler)), RPC_URL)
+
+
+def json_response(body) -> httpx.Response:
+    return httpx.Response(200, content=orjson.dumps(body))
+
+
+async def test_call_sends_single_object():
+    requests = []
+
+    def handler(request):
+        body = orjson.loads(request.content)
+        requests.append(body)
+        return json_response({"jsonrpc": "2.0", "id": body["id"], "result": {"value": 42}})
+
+    result = await make_rpc(handler).call("getBalance", ["address"])
+
+    assert result == {"value": 42}
+    assert isinstance(requests[0], dict)
+    assert requests[0]["method"] == "getBalance"
+
+
+async def test_call_error():
+    def handler(request):
+        return json_response({"jsonrpc": "2.0", "id": 0, "error": {"code": -32602, "message": "bad"}})
+
+    with pytest.raises(ValueError, match="Ошибка RPC getBalance"):
+        await make_rpc(handler).call("getBalance", [])
+
+
+async def test_batch_matches_responses_by_id():
+    def handler(request):
+        body = orjson.loads(request.content)
+        # Ответы в обратном порядке
+        return json_response([
+            {"jsonrpc": "2.0", "id": item["id"], "result": item["method"]}
+            for item in reversed(body)
+        ])
+
+    results = await make_rpc(handler).batch([("getBalance", []), ("getAccountInfo", []), ("getSlot", [])])
+
+    assert results == ["getBalance", "getAccountInfo", "getSlot"]
+
+
+async def test_batch_item_error():
+    def handler(request):
+        return json_response([
+            {"jsonrpc": "2.0", "id": 0, "result": 1},
+            {"jsonrpc": "2.0", "id": 1, "error": {"code": -32602, "message": "bad"}},
+        ])
+
+    with pytest.raises(ValueError, match="Ошибка RPC getAccountInfo"):
+        await make_rpc(handler).batch([("getBalance", []), ("getAccountInfo", [])])
+
+
+async def test_batch_missing_response():
+    def handler(request):
+        return json_response([{"jsonrpc": "2.0", "id": 0, "result": 1}])
+
+    with pytest.raises(ValueError, match="нет ответа"):
+        await make_rpc(handler).batch([("getBalance", []), ("getAccountInfo", [])])
+
+
+async def test_batch_rejected_by_node():
+    def handler(request):
+        return json_response({"jsonrpc": "2.0", "id": None, "error": {"code": -32600, "message": "batch disabled"}})
+
+    with pytest.raises(BatchRejectedError, match="batch disabled"):
+        await make_rpc(handler).batch([("getBalance", [])])
+
+
+async def test_http_error_propagates():
+    def handler(request):
+        return httpx.Response(503)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await make_rpc(handler).call("getBalance", [])
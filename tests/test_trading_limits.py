@@ -0,0 +1,79 @@
+"""Тесты торговых лимитов при одновременных сделках."""
+
+import asyncio
+import logging
+
+import httpx
+import pytest
+
+from src.pump_trading import TradingEngine
+from tests.conftest import make_config
+
+
+def make_engine(balance: float, **overrides) -> TradingEngine:
+    config = make_config(max_trade_size_sol=1.0, min_trade_size_sol=0.001, **overrides)
+    http_client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(500)))
+    engine = TradingEngine(config, None, http_client, logging.getLogger("test"))
+
+    async def get_wallet_balance(pubkey):
+        # Переключение задач между проверкой лимита и ответом RPC
+        await asyncio.sleep(0)
+        return balance
+
+    engine._get_wallet_balance = get_wallet_balance
+    return engine
+
+
+async def test_daily_limit_reserved_before_await():
+    engine = make_engine(balance=100.0, daily_trade_limit_sol=1.0)
+
+    results = await asyncio.gather(
+        *(engine._check_trade_limits(0.5) for _ in range(3)),
+        return_exceptions=True,
+    )
+
+    errors = [r for r in results if isinstance(r, Exception)]
+    assert len(errors) == 1
+    assert "дневной лимит" in str(errors[0])
+    assert engine.daily_volume_used == pytest.approx(1.0)
+    assert engine._inflight_sol == pytest.approx(1.0)
+
+
+async def test_inflight_sol_counted_against_balance():
+    engine = make_engine(balance=1.0, daily_trade_limit_sol=10.0)
+
+    results = await asyncio.gather(
+        engine._check_trade_limits(0.5),
+        engine._check_trade_limits(0.5),
+        return_exceptions=True,
+    )
+
+    assert results[0] is None
+    assert isinstance(results[1], ValueError)
+    assert "Недостаточно средств" in str(results[1])
+    # Объем отклоненной сделки возвращен
+    assert engine.daily_volume_used == pytest.approx(0.5)
+    assert engine._inflight_sol == pytest.approx(0.5)
+
+
+async def test_release_refunds_failed_trade_only():
+    engine = make_engine(balance=100.0, daily_trade_limit_sol=10.0)
+
+    await engine._check_trade_limits(0.5)
+    await engine._check_trade_limits(0.25)
+    engine._release_trade_reservation(0.5, executed=True)
+    engine._release_trade_reservation(0.25, executed=False)
+
+    assert engine.daily_volume_used == pytest.approx(0.5)
+    assert engine._inflight_sol == pytest.approx(0.0)
+
+
+async def test_mock_trade_releases_reservation():
+    engine = make_engine(balance=100.0, mock_trading=True)
+    engine.trading_keypair = object()
+
+    result = await engine.execute_pump_trade({"token_address": "token", "amount_sol": 0.5})
+
+    assert result.success
+    assert engine.daily_volume_used == pytest.approx(0.0)
+    assert engine._inflight_sol == pytest.approx(0.0)
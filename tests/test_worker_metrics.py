@@ -0,0 +1,47 @@
+"""Тесты метрик воркера."""
+
+import pytest
+
+pytest.importorskip("prometheus_client")
+
+from prometheus_client import CollectorRegistry, Histogram  # noqa: E402
+
+from src.worker_metrics import FastHistogram  # noqa: E402
+
+BUCKETS = (0.1, 0.5, 1.0, 5.0)
+# Значения на границах бакетов, между ними, за последней границей и отрицательные
+VALUES = [0.0, 0.1, 0.2, 0.5, 0.50001, 1.0, 3.0, 5.0, 7.5, 1e9, -1.0]
+
+
+def bucket_samples(histogram_cls) -> dict:
+    registry = CollectorRegistry()
+    histogram = histogram_cls("duration_seconds", "test", buckets=BUCKETS, registry=registry)
+    for value in VALUES:
+        histogram.observe(value)
+    return {
+        (sample.name, tuple(sorted(sample.labels.items()))): sample.value
+        for metric in registry.collect()
+        for sample in metric.samples
+        if not sample.name.endswith("_created")
+    }
+
+
+def test_fast_histogram_matches_histogram():
+    assert bucket_samples(FastHistogram) == bucket_samples(Histogram)
+
+
+def test_fast_histogram_bucket_boundaries():
+    registry = CollectorRegistry()
+    histogram = FastHistogram("duration_seconds", "test", buckets=BUCKETS, registry=registry)
+    for value in VALUES:
+        histogram.observe(value)
+
+    buckets = {
+        sample.labels["le"]: sample.value
+        for metric in registry.collect()
+        for sample in metric.samples
+        if sample.name.endswith("_bucket")
+    }
+
+    # Граница бакета включительная (le), счетчики кумулятивные
+    assert buckets == {"0.1": 3.0, "0.5": 5.0, "1.0": 7.0, "5.0": 9.0, "+Inf": 11.0}